@@ -0,0 +1,286 @@
+import argparse
+import math
+import sqlite3
+import sys
+from itertools import islice
+
+from standard import (
+    iter_mapped_test_cases,
+    iter_test_cases,
+    minimum_kites,
+    write_answers,
+)
+
+DEFAULT_MAX_ENTRIES = 1 << 20
+LOOKUP_BATCH_SIZE = 4096
+SQLITE_INTEGER_MAX = (1 << 63) - 1
+
+
+def trivial_answer(
+    n_ribbons: int,
+    carton_size: int,
+    fleet_size: int,
+    parade_modulus: int,
+):
+    """
+    Answer the queries that need no congruence solving.
+
+    Covers odd n, p > n/2 (no positive multiple of p fits in A + B), a gcd
+    test of either congruence failing, and 4d > n, where B = 0 is the only
+    choice and the answer is n/2 if both c and p divide it.
+
+    Returns:
+        The answer, or None if the query needs the general solver.
+    """
+    if n_ribbons % 2 != 0:
+        return -1
+    half_ribbons = n_ribbons // 2
+    if 0 < half_ribbons < parade_modulus:
+        return -1
+    if half_ribbons % math.gcd(2 * fleet_size, carton_size) != 0:
+        return -1
+    if half_ribbons % math.gcd(fleet_size, parade_modulus) != 0:
+        return -1
+    if 4 * fleet_size > n_ribbons:
+        if half_ribbons % carton_size == 0 and half_ribbons % parade_modulus == 0:
+            return half_ribbons
+        return -1
+    return None
+
+
+def canonical_query(
+    n_ribbons: int,
+    carton_size: int,
+    fleet_size: int,
+    parade_modulus: int,
+) -> tuple:
+    """
+    Reduce a query by the common factor of n/2, c, d and p.
+
+    With g dividing all four, both congruences and the bound B <= n/4
+    divide through by g, so
+    minimum_kites(n, c, d, p) == g * minimum_kites(n/g, c/g, d/g, p/g)
+    whenever the right-hand answer is not -1 (and both are -1 otherwise).
+
+    Returns:
+        (scale, key) with key the canonical (n, c, d, p).
+    """
+    scale = math.gcd(n_ribbons // 2, carton_size, fleet_size, parade_modulus)
+    if scale == 1:
+        return 1, (n_ribbons, carton_size, fleet_size, parade_modulus)
+    return scale, (
+        n_ribbons // scale,
+        carton_size // scale,
+        fleet_size // scale,
+        parade_modulus // scale,
+    )
+
+
+class AnswerCache:
+    """
+    Canonical query -> answer store kept in an sqlite file across runs.
+
+    Each run stamps the entries it reads or writes with a run number; when
+    the cache is closed with more than max_entries rows, the rows with the
+    oldest stamps are evicted. Lookups go to sqlite a batch at a time
+    through a temporary key table, so each batch costs a few statements
+    rather than one query per case.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """
+        Args:
+            path: sqlite database file, created if missing.
+            max_entries: Rows kept after eviction (must be positive).
+        """
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS answers (
+                n INTEGER NOT NULL,
+                c INTEGER NOT NULL,
+                d INTEGER NOT NULL,
+                p INTEGER NOT NULL,
+                answer INTEGER NOT NULL,
+                used INTEGER NOT NULL,
+                PRIMARY KEY (n, c, d, p)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            CREATE TEMP TABLE lookup (
+                n INTEGER NOT NULL,
+                c INTEGER NOT NULL,
+                d INTEGER NOT NULL,
+                p INTEGER NOT NULL
+            );
+            """
+        )
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO meta VALUES ('run', 1)"
+                " ON CONFLICT (key) DO UPDATE SET value = value + 1"
+            )
+        self.run = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'run'"
+        ).fetchone()[0]
+        self.stats = {
+            "queries": 0,
+            "trivial": 0,
+            "hits": 0,
+            "misses": 0,
+            "uncacheable": 0,
+            "evicted": 0,
+        }
+
+    def _lookup(self, keys: list) -> dict:
+        cursor = self.connection.cursor()
+        cursor.executemany("INSERT INTO lookup VALUES (?, ?, ?, ?)", keys)
+        found = {
+            (n_ribbons, carton_size, fleet_size, parade_modulus): answer
+            for n_ribbons, carton_size, fleet_size, parade_modulus, answer in cursor.execute(
+                "SELECT n, c, d, p, answer FROM lookup JOIN answers USING (n, c, d, p)"
+            )
+        }
+        if found:
+            cursor.execute(
+                "UPDATE answers SET used = ? WHERE (n, c, d, p) IN (SELECT n, c, d, p FROM lookup)",
+                (self.run,),
+            )
+        cursor.execute("DELETE FROM lookup")
+        return found
+
+    def solve_many(self, cases) -> list:
+        """
+        Answer a batch of cases, solving only canonical queries not yet cached.
+
+        Args:
+            cases: Iterable of (n_ribbons, carton_size, fleet_size, parade_modulus).
+
+        Returns:
+            List of answers aligned with cases.
+        """
+        cases = list(cases)
+        answers = [-1] * len(cases)
+        pending: dict = {}
+        stats = self.stats
+        stats["queries"] += len(cases)
+        for index, case in enumerate(cases):
+            answer = trivial_answer(*case)
+            if answer is not None:
+                answers[index] = answer
+                stats["trivial"] += 1
+                continue
+            scale, key = canonical_query(*case)
+            if max(key) > SQLITE_INTEGER_MAX:
+                answers[index] = minimum_kites(*case)
+                stats["uncacheable"] += 1
+                continue
+            pending.setdefault(key, []).append((index, scale))
+
+        if not pending:
+            return answers
+
+        with self.connection:
+            found = self._lookup(list(pending))
+            solved = []
+            for key, users in pending.items():
+                answer = found.get(key)
+                if answer is None:
+                    answer = minimum_kites(*key)
+                    solved.append(key + (answer, self.run))
+                    stats["misses"] += len(users)
+                else:
+                    stats["hits"] += len(users)
+                for index, scale in users:
+                    answers[index] = answer if answer < 0 else scale * answer
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?)",
+                solved,
+            )
+        return answers
+
+    def solve(self, cases, batch_size: int = LOOKUP_BATCH_SIZE):
+        """
+        Lazily answer test cases batch by batch through the cache.
+
+        Yields:
+            The answer of each test case, in input order.
+        """
+        cases = iter(cases)
+        while True:
+            batch = list(islice(cases, batch_size))
+            if not batch:
+                return
+            yield from self.solve_many(batch)
+
+    def hit_rate(self) -> float:
+        """
+        Fraction of cached lookups (trivial answers excluded) that were hits.
+        """
+        looked_up = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / looked_up if looked_up else 0.0
+
+    def close(self) -> None:
+        """
+        Evict the least recently used entries beyond max_entries and close.
+        """
+        with self.connection:
+            size = self.connection.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            excess = size - self.max_entries
+            if excess > 0:
+                self.connection.execute(
+                    "DELETE FROM answers WHERE (n, c, d, p) IN"
+                    " (SELECT n, c, d, p FROM answers ORDER BY used LIMIT ?)",
+                    (excess,),
+                )
+                self.stats["evicted"] += excess
+        self.stats["size"] = size - max(excess, 0)
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main(argv=None) -> None:
+    """
+    Solve test cases like standard.py, reusing answers from a cache file.
+
+    Args:
+        argv: Command-line arguments; defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Kite Ribbon Ledger solver with a persistent answer cache.")
+    parser.add_argument("--cache", required=True, metavar="PATH", help="sqlite answer cache file")
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="evict least recently used answers beyond this many at exit",
+    )
+    parser.add_argument(
+        "--input",
+        help="read cases from this file instead of stdin",
+    )
+    args = parser.parse_args(argv)
+    if args.max_entries < 1:
+        parser.error("--max-entries must be at least 1")
+
+    if args.input is None:
+        cases = iter_test_cases(sys.stdin.buffer)
+    else:
+        cases = iter_mapped_test_cases(args.input)
+
+    with AnswerCache(args.cache, args.max_entries) as cache:
+        write_answers(cache.solve(cases), sys.stdout)
+    sys.stderr.write(f"answer cache: {cache.stats}, hit rate {cache.hit_rate():.1%}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,540 @@
+import argparse
+import sys
+from itertools import islice
+
+import numpy as np
+
+from standard import (
+    BINARY_ANSWERS_MAGIC,
+    BINARY_CASES_MAGIC,
+    BINARY_HEADER,
+    iter_mapped_windows,
+    iter_tokens,
+    minimum_kites,
+    read_binary_header,
+    solve_linear_congruence,
+)
+
+INT64_MAX = np.iinfo(np.int64).max
+MAX_DIGITS = 19
+DIGIT_POWERS = 10 ** np.arange(MAX_DIGITS - 1, -1, -1, dtype=np.uint64)
+MAPPED_WINDOW_SIZE = 1 << 18
+BINARY_BLOCK_ROWS = 1 << 16
+STREAM_BLOCK_ROWS = 1 << 14
+MULMOD_LIMIT = 1 << 60
+BINARY_DTYPE = np.dtype("<i8")
+
+
+def batch_extended_gcd(first, second) -> tuple:
+    """
+    Run the extended Euclidean algorithm on every lane of two int64 arrays.
+
+    The loop keeps going until every lane has reached a zero remainder;
+    lanes that finish early are left untouched by later iterations.
+
+    Args:
+        first: Array of nonnegative first operands.
+        second: Array of nonnegative second operands.
+
+    Returns:
+        A tuple (gcd_values, first_coefs, second_coefs) of int64 arrays with
+        first_coefs * first + second_coefs * second = gcd_values per lane.
+    """
+    old_remainder = np.array(first, dtype=np.int64)
+    remainder = np.array(second, dtype=np.int64)
+    old_first_coef = np.ones_like(old_remainder)
+    first_coef = np.zeros_like(old_remainder)
+    old_second_coef = np.zeros_like(old_remainder)
+    second_coef = np.ones_like(old_remainder)
+
+    active = np.flatnonzero(remainder != 0)
+    while active.size:
+        divisor = remainder[active]
+        quotient = old_remainder[active] // divisor
+
+        next_remainder = old_remainder[active] - quotient * divisor
+        old_remainder[active] = divisor
+        remainder[active] = next_remainder
+
+        next_first_coef = old_first_coef[active] - quotient * first_coef[active]
+        old_first_coef[active] = first_coef[active]
+        first_coef[active] = next_first_coef
+
+        next_second_coef = (
+            old_second_coef[active] - quotient * second_coef[active]
+        )
+        old_second_coef[active] = second_coef[active]
+        second_coef[active] = next_second_coef
+
+        active = active[next_remainder != 0]
+
+    return old_remainder, old_first_coef, old_second_coef
+
+
+def batch_modular_inverse(values, moduli):
+    """
+    Compute modular inverses lane by lane (every lane assumed coprime).
+
+    Args:
+        values: Array of values in [0, modulus).
+        moduli: Array of positive moduli.
+
+    Returns:
+        int64 array of inverses in [0, modulus).
+    """
+    _, value_coefs, _ = batch_extended_gcd(values, moduli)
+    return value_coefs % moduli
+
+
+def batch_mulmod(first, second, moduli):
+    """
+    Compute (first * second) % moduli without leaving int64.
+
+    Operands must lie in [0, modulus) with every modulus below 2**60. The
+    second factor is consumed three bits at a time, so every intermediate
+    stays below 2**63.
+
+    Args:
+        first: Array of first factors.
+        second: Array of second factors.
+        moduli: Array of positive moduli.
+
+    Returns:
+        int64 array of products reduced modulo moduli.
+    """
+    product = np.zeros_like(moduli)
+    for shift in range(57, -1, -3):
+        digit = (second >> shift) & 7
+        product = (product * 8) % moduli
+        product = (product + (first * digit) % moduli) % moduli
+    return product
+
+
+def minimum_kites_batch(n_ribbons, carton_size, fleet_size, parade_modulus):
+    """
+    Vectorized minimum_kites over whole arrays of test cases.
+
+    Lanes whose merged modulus does not fit in int64 are solved with the
+    scalar minimum_kites instead.
+
+    Args:
+        n_ribbons: Array of ribbon totals n.
+        carton_size: Array of TwinTail batch sizes c.
+        fleet_size: Array of QuadTail batch sizes d.
+        parade_modulus: Array of divisibility requirements p.
+
+    Returns:
+        int64 array with the minimum number of kites per lane, or -1.
+    """
+    n_ribbons = np.asarray(n_ribbons, dtype=np.int64)
+    carton_size = np.asarray(carton_size, dtype=np.int64)
+    fleet_size = np.asarray(fleet_size, dtype=np.int64)
+    parade_modulus = np.asarray(parade_modulus, dtype=np.int64)
+
+    answers = np.full(n_ribbons.shape, -1, dtype=np.int64)
+
+    half_ribbons = n_ribbons // 2
+    lanes = np.flatnonzero(
+        (n_ribbons % 2 == 0) & (parade_modulus <= half_ribbons)
+    )
+
+    n_lane = n_ribbons[lanes]
+    half_lane = half_ribbons[lanes]
+    fleet_lane = fleet_size[lanes]
+    parade_lane = parade_modulus[lanes]
+
+    # First congruence: 4d * B ≡ n (mod 2c).
+    first_full_modulus = 2 * carton_size[lanes]
+    first_coefficient = (4 * fleet_lane) % first_full_modulus
+    first_gcd = np.gcd(first_coefficient, first_full_modulus)
+    keep = n_lane % first_gcd == 0
+
+    # Second congruence: d * B ≡ n / 2 (mod p).
+    second_coefficient = fleet_lane % parade_lane
+    second_gcd = np.gcd(second_coefficient, parade_lane)
+    keep &= half_lane % second_gcd == 0
+
+    lanes = lanes[keep]
+    n_lane = n_lane[keep]
+    half_lane = half_lane[keep]
+    fleet_lane = fleet_lane[keep]
+    parade_lane = parade_lane[keep]
+    first_full_modulus = first_full_modulus[keep]
+    first_coefficient = first_coefficient[keep]
+    first_gcd = first_gcd[keep]
+    second_coefficient = second_coefficient[keep]
+    second_gcd = second_gcd[keep]
+
+    first_modulus = first_full_modulus // first_gcd
+    first_inverse = batch_modular_inverse(
+        (first_coefficient // first_gcd) % first_modulus,
+        first_modulus,
+    )
+    first_right = ((n_lane % first_full_modulus) // first_gcd) % first_modulus
+    first_residue = (first_right * first_inverse) % first_modulus
+
+    second_modulus = parade_lane // second_gcd
+    second_inverse = batch_modular_inverse(
+        (second_coefficient // second_gcd) % second_modulus,
+        second_modulus,
+    )
+    second_right = ((half_lane % parade_lane) // second_gcd) % second_modulus
+    second_residue = batch_mulmod(second_right, second_inverse, second_modulus)
+
+    # Generalized CRT merge of the two congruences.
+    merge_gcd = np.gcd(first_modulus, second_modulus)
+    residue_difference = second_residue - first_residue
+    keep = residue_difference % merge_gcd == 0
+
+    lanes = lanes[keep]
+    n_lane = n_lane[keep]
+    half_lane = half_lane[keep]
+    fleet_lane = fleet_lane[keep]
+    first_residue = first_residue[keep]
+    first_modulus = first_modulus[keep]
+    second_modulus = second_modulus[keep]
+    merge_gcd = merge_gcd[keep]
+    residue_difference = residue_difference[keep]
+
+    first_modulus_reduced = first_modulus // merge_gcd
+    second_modulus_reduced = second_modulus // merge_gcd
+
+    # merged_modulus = first_modulus * second_modulus_reduced can reach about
+    # 1e27; those lanes go to the scalar path.
+    overflow = second_modulus_reduced > INT64_MAX // first_modulus
+    if overflow.any():
+        for lane in lanes[overflow]:
+            answers[lane] = minimum_kites(
+                int(n_ribbons[lane]),
+                int(carton_size[lane]),
+                int(fleet_size[lane]),
+                int(parade_modulus[lane]),
+            )
+        fits = ~overflow
+        lanes = lanes[fits]
+        n_lane = n_lane[fits]
+        half_lane = half_lane[fits]
+        fleet_lane = fleet_lane[fits]
+        first_residue = first_residue[fits]
+        first_modulus = first_modulus[fits]
+        merge_gcd = merge_gcd[fits]
+        residue_difference = residue_difference[fits]
+        first_modulus_reduced = first_modulus_reduced[fits]
+        second_modulus_reduced = second_modulus_reduced[fits]
+
+    merge_inverse = batch_modular_inverse(
+        first_modulus_reduced % second_modulus_reduced,
+        second_modulus_reduced,
+    )
+    right_constant = (residue_difference // merge_gcd) % second_modulus_reduced
+    multiplier = batch_mulmod(
+        right_constant,
+        merge_inverse,
+        second_modulus_reduced,
+    )
+
+    merged_modulus = first_modulus * second_modulus_reduced
+    merged_residue = first_residue + first_modulus * multiplier
+
+    maximum_fleets = n_lane // (4 * fleet_lane)
+    keep = merged_residue <= maximum_fleets
+
+    lanes = lanes[keep]
+    half_lane = half_lane[keep]
+    fleet_lane = fleet_lane[keep]
+    merged_residue = merged_residue[keep]
+    merged_modulus = merged_modulus[keep]
+    maximum_fleets = maximum_fleets[keep]
+
+    step_count = (maximum_fleets - merged_residue) // merged_modulus
+    best_fleets = merged_residue + step_count * merged_modulus
+    answers[lanes] = half_lane - fleet_lane * best_fleets
+    return answers
+
+
+def sweep_parade_sizes_batch(n_ribbons: int, carton_size: int, fleet_size: int, parade_moduli):
+    """
+    Vectorized parade_sweep.sweep_parade_sizes: minimum_kites for one (n, c, d)
+    and a whole array of p.
+
+    The p-independent first congruence B/d ≡ r (mod m) is solved once on
+    the scalar path; with B/d = r + m * j the second congruence becomes
+    d * m * j ≡ n/2 - d * r (mod p) with a fixed coefficient and right-hand
+    side, solved for every lane at once. No lane needs a CRT merge, and
+    every intermediate stays below n/2 or below p; only lanes with
+    p >= 2**60, beyond batch_mulmod, go to the scalar minimum_kites.
+
+    Args:
+        n_ribbons: Total number of ribbons n.
+        carton_size: TwinTail batch size c.
+        fleet_size: QuadTail batch size d.
+        parade_moduli: Array of divisibility requirements p.
+
+    Returns:
+        int64 array with the minimum number of kites per p, or -1.
+    """
+    parade_moduli = np.asarray(parade_moduli, dtype=np.int64)
+    answers = np.full(parade_moduli.shape, -1, dtype=np.int64)
+    if n_ribbons % 2 != 0:
+        return answers
+
+    half_ribbons = n_ribbons // 2
+    maximum_fleets = n_ribbons // (4 * fleet_size)
+    if maximum_fleets == 0:
+        if half_ribbons % carton_size == 0:
+            answers[half_ribbons % parade_moduli == 0] = half_ribbons
+        return answers
+
+    first_solution = solve_linear_congruence(4 * fleet_size, n_ribbons, 2 * carton_size)
+    if first_solution is None or first_solution[0] > maximum_fleets:
+        return answers
+    first_residue, first_modulus = first_solution
+    maximum_steps = (maximum_fleets - first_residue) // first_modulus
+
+    lanes = np.flatnonzero((half_ribbons == 0) | (parade_moduli <= half_ribbons))
+    wide = parade_moduli[lanes] >= MULMOD_LIMIT
+    if wide.any():
+        for lane in lanes[wide]:
+            answers[lane] = minimum_kites(n_ribbons, carton_size, fleet_size, int(parade_moduli[lane]))
+        lanes = lanes[~wide]
+    parade_lane = parade_moduli[lanes]
+    coefficient = (fleet_size * first_modulus) % parade_lane
+    right_side = (half_ribbons - fleet_size * first_residue) % parade_lane
+    gcd_value = np.gcd(coefficient, parade_lane)
+    keep = right_side % gcd_value == 0
+
+    lanes = lanes[keep]
+    gcd_value = gcd_value[keep]
+    step_modulus = parade_lane[keep] // gcd_value
+    inverse = batch_modular_inverse(
+        (coefficient[keep] // gcd_value) % step_modulus,
+        step_modulus,
+    )
+    first_step = batch_mulmod(
+        (right_side[keep] // gcd_value) % step_modulus,
+        inverse,
+        step_modulus,
+    )
+    keep = first_step <= maximum_steps
+
+    lanes = lanes[keep]
+    step_modulus = step_modulus[keep]
+    first_step = first_step[keep]
+    best_step = first_step + (maximum_steps - first_step) // step_modulus * step_modulus
+    answers[lanes] = half_ribbons - fleet_size * (first_residue + first_modulus * best_step)
+    return answers
+
+
+def _fold_digits(chunk):
+    """
+    Turn the bytes of a window into int64 values, or None if malformed.
+    """
+    digit = (chunk >= 48) & (chunk <= 57)
+    space = (chunk == 32) | ((chunk >= 9) & (chunk <= 13))
+    if not (digit | space).all():
+        return None
+
+    edges = np.diff(digit.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if (ends - starts).max(initial=0) > MAX_DIGITS:
+        return None
+
+    # Row i holds the last MAX_DIGITS byte positions of token i; positions
+    # before the token start contribute a zero digit.
+    positions = ends[:, None] + np.arange(-MAX_DIGITS, 0)
+    digits = np.where(
+        positions >= starts[:, None],
+        chunk[np.maximum(positions, 0)] - 48,
+        0,
+    ).astype(np.uint64)
+    values = (digits * DIGIT_POWERS).sum(axis=1, dtype=np.uint64)
+    if (values > INT64_MAX).any():
+        return None
+    return values.astype(np.int64)
+
+
+def parse_window_integers(mapped, start: int, end: int):
+    """
+    Parse the nonnegative integers of mapped[start:end] into an int64 array.
+
+    The digits are read in place through np.frombuffer over the mapping, so
+    no bytes or int object is created per token.
+
+    Args:
+        mapped: mmap (or any buffer) holding the file.
+        start: First byte of the window.
+        end: One past the last byte of the window; must not cut a number.
+
+    Returns:
+        int64 array of the window's integers in order.
+
+    Raises:
+        ValueError: If the window holds anything but nonnegative decimal
+        integers below 2**63 separated by ASCII whitespace.
+    """
+    chunk = np.frombuffer(mapped, dtype=np.uint8, count=end - start, offset=start)
+    values = _fold_digits(chunk)
+    del chunk
+    if values is None:
+        raise ValueError("input holds a token that is not a nonnegative int64")
+    return values
+
+
+def iter_mapped_case_blocks(path: str, window_size: int = MAPPED_WINDOW_SIZE):
+    """
+    Yield the test cases of an input file as (k, 4) int64 arrays.
+
+    Args:
+        path: Path of the input file (t followed by the cases).
+        window_size: Approximate number of bytes parsed per block.
+
+    Yields:
+        Arrays whose rows are (n, c, d, p), in input order.
+    """
+    carry = np.empty(0, dtype=np.int64)
+    remaining = None
+    for mapped, start, end in iter_mapped_windows(path, window_size):
+        values = parse_window_integers(mapped, start, end)
+        if carry.size:
+            values = np.concatenate((carry, values))
+        if remaining is None:
+            if not values.size:
+                continue
+            remaining = int(values[0])
+            values = values[1:]
+
+        usable = min(values.size // 4, remaining) * 4
+        if usable:
+            yield values[:usable].reshape(-1, 4)
+            remaining -= usable // 4
+        if remaining == 0:
+            return
+        carry = values[usable:]
+
+
+def iter_stream_case_blocks(stream, block_rows: int = STREAM_BLOCK_ROWS):
+    """
+    Yield the test cases of a text stream as (k, 4) int64 arrays.
+
+    The stream is tokenized with iter_tokens and at most block_rows cases
+    are held at a time, so pipes and sockets use as little memory as the
+    memory-mapped path.
+
+    Args:
+        stream: Binary file-like object holding t followed by the cases.
+        block_rows: Number of cases per block.
+
+    Yields:
+        Arrays whose rows are (n, c, d, p), in input order.
+    """
+    tokens = iter_tokens(stream)
+    remaining = 4 * next(tokens, 0)
+    while remaining:
+        values = np.fromiter(islice(tokens, min(4 * block_rows, remaining)), dtype=np.int64)
+        usable = values.size // 4 * 4
+        if usable:
+            yield values[:usable].reshape(-1, 4)
+        if usable < min(4 * block_rows, remaining):
+            return
+        remaining -= usable
+
+
+def read_binary_case_blocks(path=None, block_rows: int = BINARY_BLOCK_ROWS) -> tuple:
+    """
+    Read a binary case file as int64 arrays without parsing any text.
+
+    A file is memory-mapped and sliced into blocks of block_rows cases;
+    stdin is read whole and viewed with frombuffer.
+
+    Args:
+        path: Path of the binary case file, or None for stdin.
+        block_rows: Number of cases per yielded block.
+
+    Returns:
+        (case_count, blocks) where blocks is an iterable of arrays whose rows
+        are (n, c, d, p), in input order.
+    """
+    if path is None:
+        case_count = read_binary_header(sys.stdin.buffer, BINARY_CASES_MAGIC)
+        table = np.frombuffer(
+            sys.stdin.buffer.read(),
+            dtype=BINARY_DTYPE,
+            count=4 * case_count,
+        ).reshape(case_count, 4)
+    else:
+        with open(path, "rb") as handle:
+            case_count = read_binary_header(handle, BINARY_CASES_MAGIC)
+        if case_count == 0:
+            return 0, []
+        table = np.memmap(
+            path,
+            dtype=BINARY_DTYPE,
+            mode="r",
+            offset=BINARY_HEADER.size,
+            shape=(case_count, 4),
+        )
+    blocks = (
+        table[start:start + block_rows].astype(np.int64)
+        for start in range(0, case_count, block_rows)
+    )
+    return case_count, blocks
+
+
+def main(argv=None) -> None:
+    """
+    Read input, solve all test cases in vectorized batches, and print outputs.
+
+    Args:
+        argv: Command-line arguments; defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Vectorized Kite Ribbon Ledger solver.")
+    parser.add_argument(
+        "--input",
+        help="memory-map cases from this file instead of reading stdin",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "binary"),
+        default="text",
+        help="read binary case records and write binary answer records"
+        " instead of decimal text",
+    )
+    args = parser.parse_args(argv)
+
+    if args.format == "binary":
+        try:
+            case_count, blocks = read_binary_case_blocks(args.input)
+        except ValueError as e:
+            parser.exit(1, f"error: {e}\n")
+        output = sys.stdout.buffer
+        output.write(BINARY_HEADER.pack(BINARY_ANSWERS_MAGIC, case_count))
+        for block in blocks:
+            answers = minimum_kites_batch(
+                block[:, 0],
+                block[:, 1],
+                block[:, 2],
+                block[:, 3],
+            )
+            output.write(answers.astype(BINARY_DTYPE).tobytes())
+        return
+
+    if args.input is None:
+        blocks = iter_stream_case_blocks(sys.stdin.buffer)
+    else:
+        blocks = iter_mapped_case_blocks(args.input)
+
+    separator = ""
+    for block in blocks:
+        answers = minimum_kites_batch(
+            block[:, 0],
+            block[:, 1],
+            block[:, 2],
+            block[:, 3],
+        )
+        sys.stdout.write(separator + "\n".join(map(str, answers.tolist())))
+        separator = "\n"
+
+
+if __name__ == "__main__":
+    main()
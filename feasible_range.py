@@ -0,0 +1,208 @@
+import math
+
+from standard import merge_congruences, modular_inverse
+
+
+def floor_sum(count: int, modulus: int, multiplier: int, offset: int) -> int:
+    """
+    Compute sum of (multiplier * i + offset) // modulus for i in [0, count).
+
+    Runs in O(log modulus) steps by the Euclid-like reduction; negative
+    multiplier or offset are folded into the nonnegative case first.
+
+    Args:
+        count: Number of terms (nonnegative).
+        modulus: Positive divisor.
+        multiplier: Coefficient of i.
+        offset: Constant term.
+
+    Returns:
+        The exact sum.
+    """
+    total = 0
+    while True:
+        if not 0 <= multiplier < modulus:
+            total += count * (count - 1) // 2 * (multiplier // modulus)
+            multiplier %= modulus
+        if not 0 <= offset < modulus:
+            total += count * (offset // modulus)
+            offset %= modulus
+        y_max = multiplier * count + offset
+        if y_max < modulus:
+            return total
+        count, offset = divmod(y_max, modulus)
+        modulus, multiplier = multiplier, modulus
+
+
+class FeasibleIndex:
+    """
+    The set of ribbon totals n admitting a valid shipment for fixed (c, d, p).
+
+    With m = n / 2 and B = d * k, minimum_kites needs 2d * k ≡ m (mod c) and
+    d * k ≡ m (mod p). Both hold for some m only when k is a multiple of
+    k0 = g / gcd(g, d) with g = gcd(c, p); writing k = k0 * t, they say
+    m ≡ t * mu (mod L) with L = lcm(c, p), and the shipment fits iff
+    2d * k0 * t <= m. So the feasible m form the union over t in [0, T) of
+    the progressions {t * mu mod L + j * L >= 2d * k0 * t}, where T is the
+    order of mu modulo L.
+
+    In terms of x = m / h (h = gcd(mu, L)), x is feasible iff the smallest
+    valid t, (u * x) mod T, is at most floor(h * x / D) with D = 2d * k0.
+    Counting that condition reduces to two floor sums, so count, membership
+    and next-feasible queries take polylog time independent of R - L.
+    """
+
+    def __init__(
+        self,
+        carton_size: int,
+        fleet_size: int,
+        parade_modulus: int,
+    ) -> None:
+        """
+        Args:
+            carton_size: TwinTail batch size c.
+            fleet_size: QuadTail batch size d.
+            parade_modulus: Divisibility requirement p for total kites.
+        """
+        self.carton_size = carton_size
+        self.fleet_size = fleet_size
+        self.parade_modulus = parade_modulus
+
+        shared_gcd = math.gcd(carton_size, parade_modulus)
+        fleet_multiple = shared_gcd // math.gcd(shared_gcd, fleet_size)
+        self.fleet_multiple = fleet_multiple
+        self.threshold_step = 2 * fleet_size * fleet_multiple
+
+        residue_step, self.residue_modulus = merge_congruences(
+            (2 * fleet_size * fleet_multiple) % carton_size,
+            carton_size,
+            (fleet_size * fleet_multiple) % parade_modulus,
+            parade_modulus,
+        )
+        self.residue_step = residue_step
+
+        self.half_step = math.gcd(residue_step, self.residue_modulus)
+        self.period = self.residue_modulus // self.half_step
+        self.step_inverse = modular_inverse(
+            (residue_step // self.half_step) % self.period,
+            self.period,
+        )
+
+        # From this x on, floor(h * x / D) >= T - 1 so every x is feasible.
+        self.dense_start = -(
+            -(self.period - 1) * self.threshold_step // self.half_step
+        )
+
+    def _smallest_multiplier(self, x_value: int) -> int:
+        return self.step_inverse * x_value % self.period
+
+    def _is_feasible_x(self, x_value: int) -> bool:
+        return (
+            self._smallest_multiplier(x_value)
+            <= self.half_step * x_value // self.threshold_step
+        )
+
+    def _count_x(self, x_limit: int) -> int:
+        """
+        Count feasible x in [0, x_limit].
+        """
+        if x_limit < 0:
+            return 0
+
+        sparse_limit = min(x_limit, self.dense_start - 1)
+        total = max(0, x_limit - max(sparse_limit, -1))
+        if sparse_limit < 0:
+            return total
+
+        # For x below dense_start at most one j satisfies
+        # (D * u - h) * x <= D * T * j <= D * u * x, and it exists iff x
+        # is feasible; count those j over all x with two floor sums.
+        terms = sparse_limit + 1
+        scaled_period = self.threshold_step * self.period
+        upper = floor_sum(terms, self.period, self.step_inverse, 0)
+        lower = floor_sum(
+            terms,
+            scaled_period,
+            self.threshold_step * self.step_inverse - self.half_step,
+            scaled_period - 1,
+        )
+        return total + upper - lower + terms
+
+    def _x_range(self, low: int, high: int) -> tuple:
+        half_low = -(-low // 2)
+        half_high = high // 2
+        return -(-half_low // self.half_step), half_high // self.half_step
+
+    def is_feasible(self, n_ribbons: int) -> bool:
+        """
+        Check whether minimum_kites(n_ribbons, c, d, p) != -1.
+
+        Args:
+            n_ribbons: Total number of ribbons n (nonnegative).
+
+        Returns:
+            True iff some valid shipment uses exactly n_ribbons ribbons.
+        """
+        if n_ribbons % 2 != 0:
+            return False
+        half_ribbons = n_ribbons // 2
+        if half_ribbons % self.half_step != 0:
+            return False
+        return self._is_feasible_x(half_ribbons // self.half_step)
+
+    def count(self, low: int, high: int) -> int:
+        """
+        Count feasible ribbon totals n with low <= n <= high.
+
+        Args:
+            low: Lower bound of the range (inclusive, nonnegative).
+            high: Upper bound of the range (inclusive).
+
+        Returns:
+            Number of feasible n in the range.
+        """
+        if high < low:
+            return 0
+        x_low, x_high = self._x_range(low, high)
+        if x_high < x_low:
+            return 0
+        return self._count_x(x_high) - self._count_x(x_low - 1)
+
+    def next_feasible(self, start: int) -> int:
+        """
+        Find the smallest feasible ribbon total n >= start.
+
+        Args:
+            start: Lower bound (inclusive, nonnegative).
+
+        Returns:
+            The smallest feasible n not below start.
+        """
+        x_low, _ = self._x_range(start, start)
+        if x_low >= self.dense_start:
+            return 2 * self.half_step * x_low
+
+        base_count = self._count_x(x_low - 1)
+        low_x, high_x = x_low, max(x_low, self.dense_start)
+        while low_x < high_x:
+            middle_x = (low_x + high_x) // 2
+            if self._count_x(middle_x) > base_count:
+                high_x = middle_x
+            else:
+                low_x = middle_x + 1
+        return 2 * self.half_step * low_x
+
+    def progressions(self):
+        """
+        Yield the arithmetic progressions whose union is the feasible set.
+
+        Yields:
+            (first_n, step_n) for each multiplier t in [0, T): every
+            first_n + j * step_n with j >= 0 is feasible.
+        """
+        step_n = 2 * self.residue_modulus
+        for multiplier in range(self.period):
+            residue = multiplier * self.residue_step % self.residue_modulus
+            shortfall = self.threshold_step * multiplier - residue
+            lift = max(0, -(-shortfall // self.residue_modulus))
+            yield 2 * (residue + lift * self.residue_modulus), step_n
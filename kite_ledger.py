@@ -0,0 +1,87 @@
+import standard
+
+
+class KiteLedger:
+    """
+    The minimum_kites answer for fixed (c, d, p), kept current as n changes.
+
+    The ledger holds the cached SolverPlan of its triple plus n reduced
+    modulo 2c and 2p. An update shifts those two remainders by the delta and
+    hands them to SolverPlan.minimum_kites_from_remainders, so each
+    update is a constant number of word-sized modular operations instead of
+    two solve_linear_congruence calls and a merge_congruences call.
+    """
+
+    def __init__(
+        self,
+        carton_size: int,
+        fleet_size: int,
+        parade_modulus: int,
+        n_ribbons: int = 0,
+    ) -> None:
+        """
+        Args:
+            carton_size: TwinTail batch size c.
+            fleet_size: QuadTail batch size d.
+            parade_modulus: Divisibility requirement p for total kites.
+            n_ribbons: Initial ribbon stock n (nonnegative).
+        """
+        if n_ribbons < 0:
+            raise ValueError("Ribbon stock cannot be negative.")
+
+        self.plan = standard.compile_plan(carton_size, fleet_size, parade_modulus)
+        self.n_ribbons = n_ribbons
+        self._carton_remainder = n_ribbons % self.plan.first_full_modulus
+        self._parade_remainder = n_ribbons % (2 * parade_modulus)
+        self.answer = self._solve()
+
+    def add_ribbons(self, delta: int) -> int:
+        """
+        Change the ribbon stock by delta and return the new answer.
+
+        Args:
+            delta: Number of ribbons added (negative to remove).
+
+        Returns:
+            Minimum possible total number of kites, or -1 if impossible.
+
+        Raises:
+            ValueError: If the stock would become negative.
+        """
+        if self.n_ribbons + delta < 0:
+            raise ValueError("Ribbon stock cannot be negative.")
+
+        plan = self.plan
+        self.n_ribbons += delta
+        self._carton_remainder = (
+            (self._carton_remainder + delta) % plan.first_full_modulus
+        )
+        self._parade_remainder = (
+            (self._parade_remainder + delta) % (2 * plan.parade_modulus)
+        )
+        self.answer = self._solve()
+        return self.answer
+
+    def remove_ribbons(self, delta: int) -> int:
+        """
+        Take delta ribbons out of the stock and return the new answer.
+
+        Args:
+            delta: Number of ribbons removed.
+
+        Returns:
+            Minimum possible total number of kites, or -1 if impossible.
+
+        Raises:
+            ValueError: If the stock would become negative.
+        """
+        return self.add_ribbons(-delta)
+
+    def _solve(self) -> int:
+        # n is even whenever the plan reads it, and then
+        # (n mod 2p) / 2 == (n / 2) mod p.
+        return self.plan.minimum_kites_from_remainders(
+            self.n_ribbons,
+            self._carton_remainder,
+            self._parade_remainder // 2,
+        )
@@ -0,0 +1,277 @@
+import argparse
+import asyncio
+import os
+import sys
+
+from standard import minimum_kites, minimum_kites_many
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7353
+MAX_BATCH_SIZE = 4096
+BATCH_WINDOW = 0.0002
+MAX_PENDING_REQUESTS = 1024
+MAX_REQUEST_CASES = 1 << 16
+# Upper bounds of n, c, d and p; every value must also be at least 1.
+CASE_BOUNDS = (10**18, 10**9, 10**9, 10**18)
+
+
+def solve_scalar(cases: list) -> list:
+    return [minimum_kites(*case) for case in cases]
+
+
+def solve_numpy(cases: list) -> list:
+    import numpy as np
+
+    from batch_solver import minimum_kites_batch
+
+    table = np.array(cases, dtype=np.int64).reshape(-1, 4)
+    return minimum_kites_batch(table[:, 0], table[:, 1], table[:, 2], table[:, 3]).tolist()
+
+
+BATCH_SOLVERS = {
+    "scalar": solve_scalar,
+    "many": minimum_kites_many,
+    "numpy": solve_numpy,
+}
+
+
+class CoalescingSolver:
+    """
+    Merges the cases of concurrent requests into micro-batches.
+
+    Requests wait in a bounded queue; once it holds MAX_PENDING_REQUESTS
+    entries, submitting blocks, the connection handler stops reading its
+    socket and the kernel pushes back on the client. A single batching task
+    takes whatever is queued (waiting batch_window seconds for more if the
+    batch is still small), solves it with one call of the batch solver in
+    the loop's default executor and hands each request its slice of the
+    answers. If that call fails, the batch is solved again request by
+    request so that only the requests that fail get the error.
+    """
+
+    def __init__(
+        self,
+        solve_batch=solve_scalar,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        batch_window: float = BATCH_WINDOW,
+        max_pending: int = MAX_PENDING_REQUESTS,
+    ) -> None:
+        """
+        Args:
+            solve_batch: Function list of (n, c, d, p) -> list of answers.
+            max_batch_size: Cases after which a batch is closed.
+            batch_window: Seconds to wait for more requests to join a batch.
+            max_pending: Requests queued before submitters block.
+        """
+        self.solve_batch = solve_batch
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.batches = 0
+        self.cases = 0
+
+    async def solve(self, cases: list) -> list:
+        """
+        Queue one request and wait for its answers.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((cases, future))
+        return await future
+
+    def _drain(self, batch: list, size: int) -> int:
+        while size < self.max_batch_size and not self._queue.empty():
+            item = self._queue.get_nowait()
+            batch.append(item)
+            size += len(item[0])
+        return size
+
+    async def run(self) -> None:
+        """
+        Batching loop; runs until cancelled.
+        """
+        while True:
+            batch = [await self._queue.get()]
+            size = self._drain(batch, len(batch[0][0]))
+            if size < self.max_batch_size and self.batch_window > 0:
+                await asyncio.sleep(self.batch_window)
+                size = self._drain(batch, size)
+
+            cases = [case for request, _ in batch for case in request]
+            loop = asyncio.get_running_loop()
+            try:
+                answers = await loop.run_in_executor(None, self.solve_batch, cases)
+            except Exception:
+                await self._solve_each(batch)
+                continue
+
+            self.batches += 1
+            self.cases += len(cases)
+            start = 0
+            for request, future in batch:
+                if not future.done():
+                    future.set_result(answers[start:start + len(request)])
+                start += len(request)
+
+    async def _solve_each(self, batch: list) -> None:
+        loop = asyncio.get_running_loop()
+        for request, future in batch:
+            try:
+                answers = await loop.run_in_executor(None, self.solve_batch, request)
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+                continue
+            self.batches += 1
+            self.cases += len(request)
+            if not future.done():
+                future.set_result(answers)
+
+
+async def read_request(reader: asyncio.StreamReader):
+    """
+    Read one request in main()'s format: t, then 4 * t integers.
+
+    Returns:
+        The list of cases, or None at end of stream.
+
+    Raises:
+        ValueError: If the request is malformed or cut short, or t exceeds
+            MAX_REQUEST_CASES.
+    """
+    tokens: list = []
+    while not tokens:
+        line = await reader.readline()
+        if not line:
+            return None
+        tokens = line.split()
+    case_count = int(tokens[0])
+    if not 0 <= case_count <= MAX_REQUEST_CASES:
+        raise ValueError(f"t must be between 0 and {MAX_REQUEST_CASES}")
+
+    values = [int(token) for token in tokens[1:]]
+    while len(values) < 4 * case_count:
+        line = await reader.readline()
+        if not line:
+            raise ValueError(f"expected {4 * case_count} integers after t, got {len(values)}")
+        values.extend(int(token) for token in line.split())
+    if len(values) != 4 * case_count:
+        raise ValueError("extra integers after the last case")
+    return list(zip(*[iter(values)] * 4))
+
+
+def check_cases(cases: list) -> None:
+    """
+    Raises:
+        ValueError: If a value of a case lies outside CASE_BOUNDS.
+    """
+    for index, case in enumerate(cases):
+        for value, upper in zip(case, CASE_BOUNDS):
+            if not 1 <= value <= upper:
+                raise ValueError(f"case {index + 1}: {value} is out of range [1, {upper}]")
+
+
+def make_handler(solver: CoalescingSolver):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    cases = await read_request(reader)
+                except ValueError as error:
+                    writer.write(f"error: {error}\n".encode())
+                    break
+                if cases is None:
+                    break
+                try:
+                    check_cases(cases)
+                    answers = await solver.solve(cases) if cases else []
+                except Exception as error:
+                    writer.write(f"error: {error}\n".encode())
+                else:
+                    writer.write("".join(f"{answer}\n" for answer in answers).encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(args) -> None:
+    solver = CoalescingSolver(
+        BATCH_SOLVERS[args.solver],
+        args.max_batch,
+        args.batch_window,
+        args.max_pending,
+    )
+    batching = asyncio.create_task(solver.run())
+    handler = make_handler(solver)
+    if args.unix is not None:
+        server = await asyncio.start_unix_server(handler, path=args.unix)
+        where = args.unix
+    else:
+        server = await asyncio.start_server(handler, args.host, args.port)
+        where = f"{args.host}:{args.port}"
+    sys.stderr.write(f"serving on {where} with the {args.solver} batch solver\n")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batching.cancel()
+        if args.unix is not None and os.path.exists(args.unix):
+            os.unlink(args.unix)
+        sys.stderr.write(f"solved {solver.cases} cases in {solver.batches} batches\n")
+
+
+def main(argv=None) -> None:
+    """
+    Serve minimum_kites over TCP or a Unix socket.
+
+    Each request is t followed by t cases, exactly as main() in standard.py
+    reads them; the reply is one answer per line. A connection may send any
+    number of requests one after another. A request with a value out of
+    range, or whose cases fail to solve, gets a single "error: ..." line
+    instead; a malformed request gets one and closes the connection.
+
+    Args:
+        argv: Command-line arguments; defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Kite Ribbon Ledger query server.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="TCP address to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port to bind")
+    parser.add_argument("--unix", metavar="PATH", help="listen on this Unix socket instead of TCP")
+    parser.add_argument(
+        "--solver",
+        choices=sorted(BATCH_SOLVERS),
+        default="scalar",
+        help="how each micro-batch is solved",
+    )
+    parser.add_argument(
+        "--max-batch",
+        type=int,
+        default=MAX_BATCH_SIZE,
+        help="close a micro-batch once it holds this many cases",
+    )
+    parser.add_argument(
+        "--batch-window",
+        type=float,
+        default=BATCH_WINDOW,
+        metavar="SECONDS",
+        help="wait this long for more requests to join a small batch",
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=MAX_PENDING_REQUESTS,
+        help="queued requests before clients are pushed back",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
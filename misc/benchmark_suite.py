@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+MISC_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(MISC_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, MISC_DIR)
+
+import euclid_worst_case_search  # noqa: E402
+import standard  # noqa: E402
+import stress_corpus_generator  # noqa: E402
+
+DEFAULT_CASES = 100000
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_REPEATS = 3
+# Machine-specific, so kept out of version control (see .gitignore).
+DEFAULT_BASELINE = os.path.join(MISC_DIR, "benchmark_baseline.json")
+SEED = 20240710
+# Corpus shapes: stress_corpus_generator mixes, plus the Euclid worst case.
+SHAPES = {
+    "mixed": stress_corpus_generator.DEFAULT_MIX,
+    "repeated": "repeated=1",
+    "distinct": "distinct=1",
+    "feasible": "feasible=1",
+    "worst_euclid": None,
+}
+
+
+def write_corpus(shape: str, case_count: int, path: str) -> None:
+    """
+    Write the corpus of one shape to path.
+    """
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        if SHAPES[shape] is None:
+            scored = euclid_worst_case_search.search(case_count, SEED)
+            f.write(euclid_worst_case_search.format_cases(scored))
+        else:
+            mix = stress_corpus_generator.parse_mix(SHAPES[shape])
+            stress_corpus_generator.write_corpus(f, case_count, SEED, mix)
+
+
+def percentile(sorted_values: list, q: float):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def bench_kernel(cases: list, repeats: int) -> dict:
+    """
+    Throughput of a tight minimum_kites loop (best of repeats), then
+    per-call latency.
+    """
+    solve = standard.minimum_kites
+    elapsed = None
+    for _ in range(repeats):
+        began = time.perf_counter()
+        for case in cases:
+            solve(*case)
+        lap = time.perf_counter() - began
+        elapsed = lap if elapsed is None else min(elapsed, lap)
+
+    clock = time.perf_counter_ns
+    latencies = []
+    for case in cases:
+        start = clock()
+        solve(*case)
+        latencies.append(clock() - start)
+    latencies.sort()
+    return {
+        "qps": len(cases) / elapsed,
+        "p50_ns": percentile(latencies, 0.50),
+        "p99_ns": percentile(latencies, 0.99),
+        "max_ns": latencies[-1],
+    }
+
+
+# Runs argv[1:] from a bare interpreter and prints "exit_code seconds maxrss".
+# A child's peak RSS starts from its parent's at fork/exec time, so spawning
+# straight from this (much larger) process would inflate it.
+SPAWN_PROBE = """
+import os, sys, time
+devnull = [(os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_WRONLY, 0) for fd in (1, 2)]
+began = time.perf_counter()
+pid = os.posix_spawn(sys.argv[1], sys.argv[1:], os.environ, file_actions=devnull)
+_, status, usage = os.wait4(pid, 0)
+print(os.waitstatus_to_exitcode(status), time.perf_counter() - began, usage.ru_maxrss)
+"""
+
+
+def bench_end_to_end(path: str, case_count: int, extra_args: list, repeats: int) -> dict:
+    """
+    Run standard.py main() in a child process (best of repeats) and read its
+    own rusage.
+    """
+    command = [sys.executable, os.path.join(ROOT_DIR, "standard.py"), "--input", path] + extra_args
+    elapsed = peak_rss_kb = None
+    for _ in range(repeats):
+        report = subprocess.run(
+            [sys.executable, "-S", "-c", SPAWN_PROBE] + command,
+            stdout=subprocess.PIPE,
+            check=True,
+            text=True,
+        ).stdout.split()
+        if int(report[0]) != 0:
+            raise RuntimeError(f"{' '.join(command)} exited with {report[0]}")
+        lap, rss = float(report[1]), int(report[2])
+        elapsed = lap if elapsed is None else min(elapsed, lap)
+        peak_rss_kb = rss if peak_rss_kb is None else max(peak_rss_kb, rss)
+    return {
+        "qps": case_count / elapsed,
+        "seconds": elapsed,
+        "peak_rss_kb": peak_rss_kb,
+    }
+
+
+def run_suite(case_count: int, shapes: list, repeats: int) -> dict:
+    """
+    Run every benchmark on every shape.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        for shape in shapes:
+            path = os.path.join(scratch, f"{shape}.in")
+            write_corpus(shape, case_count, path)
+            results[f"{shape}/main"] = bench_end_to_end(path, case_count, [], repeats)
+            results[f"{shape}/main_plan_cache"] = bench_end_to_end(
+                path, case_count, ["--plan-cache", str(standard.PLAN_CACHE_SIZE)], repeats
+            )
+            results[f"{shape}/kernel"] = bench_kernel(
+                list(standard.iter_mapped_test_cases(path)), repeats
+            )
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    List the benchmarks whose throughput fell more than threshold below the
+    baseline.
+    """
+    regressions = []
+    for name, entry in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        floor = reference["qps"] * (1 - threshold)
+        if entry["qps"] < floor:
+            regressions.append(
+                f"{name}: {entry['qps']:.0f} q/s < {floor:.0f} q/s"
+                f" ({reference['qps']:.0f} baseline - {threshold:.0%})"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark standard.py and gate on regressions.")
+    parser.add_argument("--cases", type=int, default=DEFAULT_CASES, help="cases per corpus shape")
+    parser.add_argument(
+        "--shape",
+        action="append",
+        choices=sorted(SHAPES),
+        help="corpus shape to run (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help="take the best throughput of this many runs",
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="write this run's results to the baseline file instead of comparing",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed fractional throughput drop before failing",
+    )
+    args = parser.parse_args(argv)
+
+    if args.cases < 1 or args.repeats < 1:
+        parser.error("--cases and --repeats must be at least 1")
+
+    results = run_suite(args.cases, args.shape or list(SHAPES), args.repeats)
+
+    print(f"{'benchmark':<28} {'q/s':>10} {'p50 ns':>8} {'p99 ns':>8} {'rss KB':>8}")
+    for name, entry in results.items():
+        print(
+            f"{name:<28} {entry['qps']:>10.0f}"
+            f" {entry.get('p50_ns', ''):>8} {entry.get('p99_ns', ''):>8}"
+            f" {entry.get('peak_rss_kb', ''):>8}"
+        )
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "cases": args.cases,
+                    "results": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+        print(f"baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline first")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("cases") != args.cases:
+        print(f"warning: baseline used {baseline.get('cases')} cases, this run {args.cases}")
+    regressions = compare(results, baseline["results"], args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        raise SystemExit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
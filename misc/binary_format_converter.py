@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+from array import array
+from contextlib import ExitStack
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import standard  # noqa: E402
+
+
+def cases_to_binary(source, sink) -> int:
+    """
+    Convert a text case file (t, then t lines of n c d p) to binary records.
+
+    Returns:
+        The number of cases converted.
+    """
+    tokens = standard.iter_tokens(source)
+    case_count = next(tokens, 0)
+    sink.write(standard.BINARY_HEADER.pack(standard.BINARY_CASES_MAGIC, case_count))
+    wanted = 4 * case_count
+    written = 0
+    while written < wanted:
+        values = array("q", islice(tokens, min(4 * standard.WRITE_BATCH_SIZE, wanted - written)))
+        if not values:
+            raise ValueError(f"text input ends after {written // 4} of {case_count} cases")
+        if sys.byteorder != "little":
+            values.byteswap()
+        sink.write(values.tobytes())
+        written += len(values)
+    return case_count
+
+
+def binary_to_cases(source, sink) -> int:
+    """
+    Convert binary case records back to the text case format.
+
+    Returns:
+        The number of cases converted.
+    """
+    case_count = standard.read_binary_header(source, standard.BINARY_CASES_MAGIC)
+    sink.write(f"{case_count}\n".encode())
+    for values in standard.read_binary_integers(source, 4 * case_count):
+        fields = iter(values)
+        sink.write("".join("%d %d %d %d\n" % case for case in zip(fields, fields, fields, fields)).encode())
+    return case_count
+
+
+def answers_to_binary(source, sink) -> int:
+    """
+    Convert text answers (one per line) to a binary answer file.
+
+    The header needs the count up front, so answers are first collected in
+    an array of 8 bytes each.
+
+    Returns:
+        The number of answers converted.
+    """
+    answers = array("q", standard.iter_tokens(source))
+    standard.write_binary_answers(answers, sink, len(answers))
+    return len(answers)
+
+
+def binary_to_answers(source, sink) -> int:
+    """
+    Convert a binary answer file to text answers, without a trailing newline.
+
+    Returns:
+        The number of answers converted.
+    """
+    answer_count = standard.read_binary_header(source, standard.BINARY_ANSWERS_MAGIC)
+    separator = b""
+    for values in standard.read_binary_integers(source, answer_count):
+        sink.write(separator + "\n".join(map(str, values)).encode())
+        separator = b"\n"
+    return answer_count
+
+
+CONVERTERS = {
+    ("cases", "binary"): cases_to_binary,
+    ("cases", "text"): binary_to_cases,
+    ("answers", "binary"): answers_to_binary,
+    ("answers", "text"): binary_to_answers,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert case and answer files between text and binary records."
+    )
+    parser.add_argument("--to", choices=("binary", "text"), required=True, help="target format")
+    parser.add_argument(
+        "--kind",
+        choices=("cases", "answers"),
+        default="cases",
+        help="whether the file holds solver input or solver output",
+    )
+    parser.add_argument("--input", help="read from this file instead of stdin")
+    parser.add_argument("--output", help="write to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    with ExitStack() as stack:
+        source = sys.stdin.buffer if args.input is None else stack.enter_context(open(args.input, "rb"))
+        sink = sys.stdout.buffer if args.output is None else stack.enter_context(open(args.output, "wb"))
+        try:
+            CONVERTERS[args.kind, args.to](source, sink)
+        except ValueError as e:
+            parser.exit(1, f"error: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
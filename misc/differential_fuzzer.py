@@ -0,0 +1,187 @@
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from standard import minimum_kites  # noqa: E402
+
+TEST_CASES_DIR = os.path.join(ROOT_DIR, "test_cases")
+BATCH_SIZE = 20000
+BATCHES_PER_WORKER = 4
+DEFAULT_MAX_N = 10**5
+DEFAULT_MAX_CD = 64
+DEFAULT_MAX_P = 256
+SHRINK_SCAN_LIMIT = 256
+MAX_REPRODUCERS = 5
+
+
+def brute_force_kites(n_ribbons: int, carton_size: int, fleet_size: int, parade_modulus: int) -> int:
+    """
+    Independent oracle: test every B = 0, d, 2d, ... <= n/4 in one array pass.
+
+    A = n/2 - 2B, and A + B = n/2 - B is smallest for the largest valid B.
+    """
+    if n_ribbons % 2 != 0:
+        return -1
+    quad_tails = np.arange(0, n_ribbons // 4 + 1, fleet_size, dtype=np.int64)
+    twin_tails = n_ribbons // 2 - 2 * quad_tails
+    valid = (twin_tails % carton_size == 0) & ((twin_tails + quad_tails) % parade_modulus == 0)
+    hits = np.flatnonzero(valid)
+    if hits.size == 0:
+        return -1
+    return int(twin_tails[hits[-1]] + quad_tails[hits[-1]])
+
+
+def random_case(rng: random.Random, max_n: int, max_cd: int, max_p: int) -> tuple:
+    n_ribbons = rng.randint(1, max_n)
+    if rng.random() < 0.9:
+        n_ribbons += n_ribbons % 2
+    return (
+        n_ribbons,
+        rng.randint(1, max_cd),
+        rng.randint(1, max_cd),
+        rng.randint(1, max_p),
+    )
+
+
+def fuzz_batch(seed: int, batch_size: int, max_n: int, max_cd: int, max_p: int) -> list:
+    """
+    Compare minimum_kites with the oracle on one seeded batch.
+
+    Returns:
+        The cases on which they disagree.
+    """
+    rng = random.Random(seed)
+    failures = []
+    for _ in range(batch_size):
+        case = random_case(rng, max_n, max_cd, max_p)
+        if minimum_kites(*case) != brute_force_kites(*case):
+            failures.append(case)
+    return failures
+
+
+def disagrees(case: tuple) -> bool:
+    return minimum_kites(*case) != brute_force_kites(*case)
+
+
+def shrink(case: tuple) -> tuple:
+    """
+    Greedily shrink a failing case while it keeps failing.
+
+    Small parameters are scanned upwards from 1 (from 2 or 1 for n, keeping
+    its parity); large ones are tried at half their value and one step
+    below. Stops when no parameter can be lowered.
+    """
+    case = list(case)
+    improved = True
+    while improved:
+        improved = False
+        for index in range(4):
+            value = case[index]
+            step = 2 if index == 0 else 1
+            smallest = 2 - value % 2 if index == 0 else 1
+            if value <= SHRINK_SCAN_LIMIT:
+                candidates = range(smallest, value, step)
+            else:
+                candidates = (smallest, value // 2, value - step)
+            for candidate in candidates:
+                if candidate < 1 or candidate >= value:
+                    continue
+                trial = case[:index] + [candidate] + case[index + 1:]
+                if disagrees(tuple(trial)):
+                    case = trial
+                    improved = True
+                    break
+    return tuple(case)
+
+
+def write_reproducer(case: tuple) -> str:
+    """
+    Save a case under test_cases/ as test_fuzz_<k>.in/.out, with the oracle's
+    answer as the expected output.
+    """
+    index = 1
+    while os.path.exists(os.path.join(TEST_CASES_DIR, f"test_fuzz_{index}.in")):
+        index += 1
+    stem = os.path.join(TEST_CASES_DIR, f"test_fuzz_{index}")
+    with open(stem + ".in", "w", encoding="utf-8", newline="\n") as f:
+        f.write("1\n%d %d %d %d" % case)
+    with open(stem + ".out", "w", encoding="utf-8", newline="\n") as f:
+        f.write(str(brute_force_kites(*case)))
+    return stem
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Differential fuzzing of minimum_kites against a NumPy brute-force oracle."
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--cases", type=int, default=10**6, help="total random cases to try")
+    parser.add_argument("--seconds", type=float, help="stop submitting new batches after this long")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first batch")
+    parser.add_argument("--max-n", type=int, default=DEFAULT_MAX_N, help="largest n")
+    parser.add_argument("--max-cd", type=int, default=DEFAULT_MAX_CD, help="largest c and d")
+    parser.add_argument("--max-p", type=int, default=DEFAULT_MAX_P, help="largest p")
+    parser.add_argument(
+        "--max-reproducers",
+        type=int,
+        default=MAX_REPRODUCERS,
+        help="keep at most this many (smallest) distinct reproducers",
+    )
+    parser.add_argument(
+        "--no-write",
+        action="store_true",
+        help="report reproducers without writing them to test_cases/",
+    )
+    args = parser.parse_args(argv)
+
+    batch_count = -(-args.cases // BATCH_SIZE)
+    limits = (args.max_n, args.max_cd, args.max_p)
+    began = time.perf_counter()
+    deadline = None if args.seconds is None else began + args.seconds
+    tried = 0
+    failures = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        pending = []
+        next_batch = 0
+        while next_batch < batch_count or pending:
+            while (
+                next_batch < batch_count
+                and len(pending) < args.workers * BATCHES_PER_WORKER
+                and (deadline is None or time.perf_counter() < deadline)
+            ):
+                size = min(BATCH_SIZE, args.cases - next_batch * BATCH_SIZE)
+                pending.append((size, executor.submit(fuzz_batch, args.seed + next_batch, size, *limits)))
+                next_batch += 1
+            if not pending:
+                break
+            size, future = pending.pop(0)
+            failures.extend(future.result())
+            tried += size
+
+    elapsed = time.perf_counter() - began
+    print(f"{tried} cases in {elapsed:.1f}s ({tried / elapsed * 60:,.0f} cases/min), {len(failures)} failures")
+
+    reproducers = sorted({shrink(case) for case in failures}, key=lambda case: (sum(case), case))
+    reproducers = reproducers[:args.max_reproducers]
+    for case in reproducers:
+        line = "%d %d %d %d" % case
+        expected = brute_force_kites(*case)
+        got = minimum_kites(*case)
+        if args.no_write:
+            print(f"reproducer: {line} (expected {expected}, got {got})")
+        else:
+            print(f"reproducer: {line} (expected {expected}, got {got}) -> {write_reproducer(case)}.in")
+    if reproducers:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
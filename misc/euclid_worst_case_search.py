@@ -0,0 +1,226 @@
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+MISC_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(MISC_DIR))
+sys.path.insert(0, MISC_DIR)
+
+import standard  # noqa: E402
+import test_case_validator  # noqa: E402
+
+N_MAX = 10**18
+CD_MAX = 10**9
+P_MAX = 10**18
+# random_even keeps n/2 >= N_MAX / 4; a larger p is rejected by
+# minimum_kites' p > n/2 pre-filter before any Euclid step.
+P_LIFT_MAX = N_MAX // 4
+# 1/phi: a / m near this ratio makes every Euclid quotient 1.
+GOLDEN_RATIO_INVERSE = (math.sqrt(5) - 1) / 2
+# c ~ 2d / (1 + 1/phi); a d up to this keeps c * d within P_LIFT_MAX, so
+# the CRT base of p never has to be lifted past it.
+FLEET_SIZE_MAX = math.isqrt(int(P_LIFT_MAX * (1 + GOLDEN_RATIO_INVERSE) / 2))
+PARTNER_WINDOW = 64
+DEFAULT_CASES = 1000
+SEED = 20240701
+
+
+class RecordingBackend(standard.ReferenceBackend):
+    """
+    Reference backend that remembers the operands of every inverse, i.e.
+    every extended_gcd the solver runs.
+    """
+
+    name = "recording"
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def inverse(self, value: int, modulus: int) -> int:
+        self.calls.append((value, modulus))
+        return super().inverse(value, modulus)
+
+
+def euclid_cost(n_ribbons: int, carton_size: int, fleet_size: int, parade_modulus: int) -> tuple:
+    """
+    Run minimum_kites on one case and measure its number-theory work.
+
+    Returns:
+        (total_euclid_steps, inverse_calls, largest_operand_bits).
+    """
+    recorder = RecordingBackend()
+    previous = standard.get_backend().name
+    standard.BACKENDS[recorder.name] = recorder
+    try:
+        standard.set_backend(recorder.name)
+        standard.minimum_kites(n_ribbons, carton_size, fleet_size, parade_modulus)
+    finally:
+        standard.set_backend(previous)
+        del standard.BACKENDS[recorder.name]
+    steps = sum(standard.euclid_step_count(v, m) for v, m in recorder.calls)
+    bits = max((m.bit_length() for _, m in recorder.calls), default=0)
+    return steps, len(recorder.calls), bits
+
+
+def best_partner(score, candidates):
+    """
+    Return the candidate with the highest score (None if all score -1).
+    """
+    best, best_steps = None, -1
+    for candidate in candidates:
+        steps = score(candidate)
+        if steps > best_steps:
+            best, best_steps = candidate, steps
+    return best
+
+
+def golden_window(center: float, low: int, high: int):
+    middle = int(center)
+    return range(max(low, middle - PARTNER_WINDOW), min(high, middle + PARTNER_WINDOW) + 1)
+
+
+def worst_case_triple(rng: random.Random) -> tuple:
+    """
+    Build (c, d, p) whose three inverse calls all run near-Fibonacci chains.
+
+    With c odd and gcd(c, d) = gcd(c, p) = gcd(d, p) = 1 every gcd test
+    passes for every even n, and minimum_kites inverts 2d mod c modulo c,
+    d modulo p, and c modulo p. Each of those chains is longest when the
+    remainder after the first division is about 1/phi of the divisor:
+    c ~ 2d / (1 + 1/phi), p mod d ~ d / phi and p mod c ~ c / phi. The two
+    residues of p are joined with the CRT, and p is lifted by multiples of
+    c * d up to P_LIFT_MAX, so 1 <= p <= n/2 and the merged modulus nears
+    1e26.
+    """
+    while True:
+        fleet_size = rng.randint(CD_MAX // 4, FLEET_SIZE_MAX)
+        carton_size = best_partner(
+            lambda c: -1 if c % 2 == 0 or math.gcd(c, fleet_size) != 1
+            else standard.euclid_step_count(2 * fleet_size % c, c),
+            golden_window(2 * fleet_size / (1 + GOLDEN_RATIO_INVERSE), 3, CD_MAX),
+        )
+        if carton_size is None:
+            continue
+        fleet_residue = best_partner(
+            lambda r: -1 if math.gcd(r, fleet_size) != 1
+            else standard.euclid_step_count(fleet_size, r),
+            golden_window(fleet_size * GOLDEN_RATIO_INVERSE, 1, fleet_size - 1),
+        )
+        carton_residue = best_partner(
+            lambda r: -1 if math.gcd(r, carton_size) != 1
+            else standard.euclid_step_count(carton_size, r),
+            golden_window(carton_size * GOLDEN_RATIO_INVERSE, 1, carton_size - 1),
+        )
+
+        merged = standard.merge_congruences(
+            fleet_residue, fleet_size, carton_residue, carton_size
+        )
+        if merged is None or merged[0] > P_LIFT_MAX:
+            continue
+        base, period = merged
+        parade_modulus = base + (P_LIFT_MAX - base) // period * period
+        return carton_size, fleet_size, parade_modulus
+
+
+def random_triple(rng: random.Random) -> tuple:
+    return rng.randint(1, CD_MAX), rng.randint(1, CD_MAX), rng.randint(1, P_MAX)
+
+
+def random_even(rng: random.Random) -> int:
+    return 2 * rng.randint(N_MAX // 4, N_MAX // 2)
+
+
+def search(case_count: int, seed: int) -> list:
+    """
+    Build case_count worst-case cases, costliest first.
+
+    Returns:
+        List of ((n, c, d, p), (steps, inverse_calls, bits)).
+    """
+    rng = random.Random(seed)
+    scored = []
+    for _ in range(case_count):
+        case = (random_even(rng),) + worst_case_triple(rng)
+        scored.append((case, euclid_cost(*case)))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored
+
+
+def format_cases(scored: list) -> str:
+    """
+    Render scored cases as an input file, checked against the problem
+    bounds with test_case_validator.
+
+    Raises:
+        ValueError: If a case falls outside the bounds.
+    """
+    body = "".join("%d %d %d %d\n" % case for case, _ in scored)
+    if test_case_validator.validate_block(body.encode()) != len(scored):
+        raise ValueError("generated cases fall outside the problem bounds")
+    return f"{len(scored)}\n" + body
+
+
+def latency_percentiles(cases, repeats: int = 5) -> dict:
+    """
+    Time minimum_kites per case (best of repeats) and report percentiles in ns.
+    """
+    timings = []
+    for case in cases:
+        best = None
+        for _ in range(repeats):
+            began = time.perf_counter_ns()
+            standard.minimum_kites(*case)
+            elapsed = time.perf_counter_ns() - began
+            best = elapsed if best is None else min(best, elapsed)
+        timings.append(best)
+    timings.sort()
+
+    def percentile(q):
+        return timings[min(len(timings) - 1, int(q * len(timings)))]
+
+    return {"p50": percentile(0.50), "p99": percentile(0.99), "max": timings[-1]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Search for cases that maximize Euclid steps in minimum_kites."
+    )
+    parser.add_argument("--cases", type=int, default=DEFAULT_CASES, help="number of cases to emit")
+    parser.add_argument("--seed", type=int, default=SEED, help="random seed")
+    parser.add_argument("--output", help="write the benchmark input here instead of stdout")
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="print step counts and latency percentiles against random cases to stderr",
+    )
+    args = parser.parse_args(argv)
+    if args.cases < 1:
+        parser.error("--cases must be at least 1")
+
+    scored = search(args.cases, args.seed)
+    text = format_cases(scored)
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+
+    if args.report:
+        rng = random.Random(args.seed + 1)
+        baseline = [(random_even(rng),) + random_triple(rng) for _ in range(args.cases)]
+        worst = [case for case, _ in scored]
+        for name, cases in (("random", baseline), ("worst", worst)):
+            steps = sorted(euclid_cost(*case)[0] for case in cases)
+            latency = latency_percentiles(cases)
+            sys.stderr.write(
+                f"{name:<7} steps mean {sum(steps) / len(steps):6.1f} max {steps[-1]:4d}"
+                f"  latency p50 {latency['p50']:6d} ns p99 {latency['p99']:6d} ns"
+                f" max {latency['max']:6d} ns\n"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import os
+import sys
+import time
+
+MISC_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(MISC_DIR))
+sys.path.insert(0, MISC_DIR)
+
+import standard  # noqa: E402
+import stress_corpus_generator  # noqa: E402
+
+DEFAULT_CASES = 200000
+DEFAULT_REPEATS = 3
+SEED = 20240720
+
+
+def general_minimum_kites(
+    n_ribbons: int,
+    carton_size: int,
+    fleet_size: int,
+    parade_modulus: int,
+) -> int:
+    """
+    minimum_kites without its pre-filters and closed forms: every even n
+    runs both linear congruences and the CRT merge. The reference that
+    the fast paths are checked and timed against.
+    """
+    if n_ribbons % 2 != 0:
+        return -1
+    maximum_fleets = n_ribbons // (4 * fleet_size)
+    first_solution = standard.solve_linear_congruence(4 * fleet_size, n_ribbons, 2 * carton_size)
+    if first_solution is None:
+        return -1
+    second_solution = standard.solve_linear_congruence(fleet_size, n_ribbons // 2, parade_modulus)
+    if second_solution is None:
+        return -1
+    merged_solution = standard.merge_congruences(*first_solution, *second_solution)
+    if merged_solution is None:
+        return -1
+    merged_residue, merged_modulus = merged_solution
+    if merged_residue > maximum_fleets:
+        return -1
+    best_fleets = merged_residue + (maximum_fleets - merged_residue) // merged_modulus * merged_modulus
+    return n_ribbons // 2 - fleet_size * best_fleets
+
+
+def best_time(solver, cases: list, repeats: int) -> float:
+    elapsed = None
+    for _ in range(repeats):
+        began = time.perf_counter()
+        for case in cases:
+            solver(*case)
+        lap = time.perf_counter() - began
+        elapsed = lap if elapsed is None else min(elapsed, lap)
+    return elapsed
+
+
+def branch_counts(cases: list) -> dict:
+    """
+    Count the exit branch and the closed forms each case takes, through the
+    stage profiler's counters.
+    """
+    profile = standard.enable_profiling(os.devnull)
+    for case in cases:
+        standard.minimum_kites(*case)
+    return dict(profile.counters)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Check minimum_kites' fast paths against the general path and report how often each fires."
+    )
+    parser.add_argument("--input", help="corpus file (default: a generated stress corpus)")
+    parser.add_argument("--cases", type=int, default=DEFAULT_CASES, help="size of the generated corpus")
+    parser.add_argument(
+        "--mix",
+        default=stress_corpus_generator.DEFAULT_MIX,
+        help="stress_corpus_generator family mix of the generated corpus",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help="take the best time of this many runs",
+    )
+    args = parser.parse_args(argv)
+    if args.cases < 1 or args.repeats < 1:
+        parser.error("--cases and --repeats must be at least 1")
+
+    if args.input is None:
+        try:
+            mix = stress_corpus_generator.parse_mix(args.mix)
+        except ValueError as e:
+            parser.error(str(e))
+        cases = list(stress_corpus_generator.iter_cases(args.cases, SEED, mix))
+    else:
+        cases = list(standard.iter_mapped_test_cases(args.input))
+    if not cases:
+        parser.error("the corpus holds no cases")
+
+    mismatches = [
+        case for case in cases
+        if standard.minimum_kites(*case) != general_minimum_kites(*case)
+    ]
+    general_seconds = best_time(general_minimum_kites, cases, args.repeats)
+    fast_seconds = best_time(standard.minimum_kites, cases, args.repeats)
+    counts = branch_counts(cases)
+
+    print(f"{len(cases)} cases, {len(mismatches)} mismatches against the general path")
+    for case in mismatches[:5]:
+        print("  mismatch: %d %d %d %d" % case)
+    print(
+        f"general {len(cases) / general_seconds:,.0f} q/s, with fast paths"
+        f" {len(cases) / fast_seconds:,.0f} q/s ({general_seconds / fast_seconds:.2f}x)"
+    )
+    print(f"{'branch':<42} {'cases':>9} {'share':>7}")
+    for name, count in sorted(counts.items(), key=lambda item: -item[1]):
+        if name.startswith(("exit.", "fast_path.")):
+            print(f"{name:<42} {count:>9} {count / len(cases):>7.1%}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
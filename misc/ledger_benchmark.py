@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kite_ledger import KiteLedger  # noqa: E402
+from standard import minimum_kites  # noqa: E402
+
+UPDATE_COUNT = 200000
+MAX_DELTA = 1000
+SEED = 20240615
+
+
+def build_stream(update_count: int, seed: int):
+    """
+    Build one (c, d, p) triple, a starting stock near 1e18 and a stream of
+    small signed ribbon deltas, the way production stock moves.
+    """
+    rng = random.Random(seed)
+    carton_size = rng.randint(1, 10**9)
+    fleet_size = rng.randint(1, 10**9)
+    parade_modulus = rng.randint(1, 10**12)
+    start = rng.randint(10**17, 10**18)
+    deltas = [rng.randint(-MAX_DELTA, MAX_DELTA) for _ in range(update_count)]
+    return (carton_size, fleet_size, parade_modulus), start, deltas
+
+
+def replay_from_scratch(triple, start, deltas) -> list:
+    carton_size, fleet_size, parade_modulus = triple
+    n_ribbons = start
+    answers = []
+    for delta in deltas:
+        n_ribbons += delta
+        answers.append(
+            minimum_kites(n_ribbons, carton_size, fleet_size, parade_modulus)
+        )
+    return answers
+
+
+def replay_ledger(triple, start, deltas) -> list:
+    ledger = KiteLedger(*triple, n_ribbons=start)
+    return [ledger.add_ribbons(delta) for delta in deltas]
+
+
+def main():
+    triple, start, deltas = build_stream(UPDATE_COUNT, SEED)
+
+    began = time.perf_counter()
+    expected = replay_from_scratch(triple, start, deltas)
+    scratch_seconds = time.perf_counter() - began
+
+    began = time.perf_counter()
+    answers = replay_ledger(triple, start, deltas)
+    ledger_seconds = time.perf_counter() - began
+
+    if answers != expected:
+        print("KiteLedger answers differ from minimum_kites")
+        raise SystemExit(1)
+
+    for name, seconds in (("scratch", scratch_seconds), ("ledger", ledger_seconds)):
+        print(
+            f"{name:<8} {seconds:.3f}s "
+            f"{seconds / len(deltas) * 1e9:.0f} ns/update"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import standard  # noqa: E402
+
+SAMPLE_SIZE = 20000
+SEED = 20240601
+
+
+def build_operands(sample_size: int, seed: int):
+    """
+    Build coprime inverse operands and CRT merge operands near the solver's
+    real sizes (moduli up to 2e9 from 2c, up to 1e18 from p).
+    """
+    rng = random.Random(seed)
+    inverse_operands = []
+    while len(inverse_operands) < sample_size:
+        modulus = rng.randint(2, 10**18)
+        value = rng.randint(1, modulus - 1)
+        if math.gcd(value, modulus) == 1:
+            inverse_operands.append((value, modulus))
+
+    merge_operands = []
+    for _ in range(sample_size):
+        first_modulus = rng.randint(1, 2 * 10**9)
+        second_modulus = rng.randint(1, 10**18)
+        merge_operands.append((
+            rng.randrange(first_modulus),
+            first_modulus,
+            rng.randrange(second_modulus),
+            second_modulus,
+        ))
+    return inverse_operands, merge_operands
+
+
+def check_backends(inverse_operands, merge_operands) -> bool:
+    """
+    Verify every backend returns exactly what the reference backend returns.
+    """
+    reference = standard.BACKENDS["reference"]
+    expected_gcd = [reference.gcd(v, m) for v, m in inverse_operands]
+    expected_inverse = [reference.inverse(v, m) for v, m in inverse_operands]
+    expected_merge = [reference.merge(*ops) for ops in merge_operands]
+
+    ok = True
+    for name, backend in standard.BACKENDS.items():
+        if [backend.gcd(v, m) for v, m in inverse_operands] != expected_gcd:
+            print(f"{name}: gcd mismatch")
+            ok = False
+        if [backend.inverse(v, m) for v, m in inverse_operands] != expected_inverse:
+            print(f"{name}: inverse mismatch")
+            ok = False
+        if [backend.merge(*ops) for ops in merge_operands] != expected_merge:
+            print(f"{name}: merge mismatch")
+            ok = False
+    return ok
+
+
+def time_per_op(function, operands) -> float:
+    start = time.perf_counter()
+    for ops in operands:
+        function(*ops)
+    return (time.perf_counter() - start) / len(operands) * 1e9
+
+
+def main():
+    inverse_operands, merge_operands = build_operands(SAMPLE_SIZE, SEED)
+    if not check_backends(inverse_operands, merge_operands):
+        raise SystemExit(1)
+
+    print(f"{'backend':<10} {'gcd ns/op':>12} {'inverse ns/op':>14} {'merge ns/op':>12}")
+    for name, backend in standard.BACKENDS.items():
+        gcd_ns = time_per_op(backend.gcd, inverse_operands)
+        inverse_ns = time_per_op(backend.inverse, inverse_operands)
+        merge_ns = time_per_op(backend.merge, merge_operands)
+        print(f"{name:<10} {gcd_ns:>12.0f} {inverse_ns:>14.0f} {merge_ns:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
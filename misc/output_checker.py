@@ -1,6 +1,19 @@
 
+import math
 import os
-from typing import Tuple, List
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
+from typing import Tuple, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import standard  # noqa: E402
+
+CHECK_CHUNK_SIZE = 1 << 14
+CHUNKS_PER_WORKER = 4
 
 
 def _is_int_token(tok: str) -> bool:
@@ -41,7 +54,99 @@ def _split_lines_strict(output_text: str) -> List[str]:
     return body.split("\n") if body != "" else []
 
 
-def check(input_text: str, output_text: str) -> Tuple[bool, str]:
+def _reduced_moduli(n: int, c: int, d: int, p: int) -> Tuple[int, int]:
+    """
+    Moduli of the fleet-count congruences 4d*k ≡ n (mod 2c) and
+    d*k ≡ n/2 (mod p): a solvable a*k ≡ b (mod M) has its solutions spaced
+    by M / gcd(a, M).
+    """
+    return 2 * c // math.gcd(4 * d, 2 * c), p // math.gcd(d, p)
+
+
+def _solves_both(n: int, c: int, d: int, p: int, k: int) -> bool:
+    return (4 * d * k - n) % (2 * c) == 0 and (d * k - n // 2) % p == 0
+
+
+def _verify_certificate(n: int, c: int, d: int, p: int, ans: int, toks: List[str]) -> str:
+    """
+    Check one certificate with a few gcds and multiplications.
+
+    Returns "" when the certificate proves ans, otherwise the reason it does not.
+    """
+    if not toks:
+        return "empty certificate"
+    kind = toks[0]
+    for tok in toks[1:]:
+        if not _is_int_token(tok):
+            return f"certificate value is not an integer: {tok!r}"
+    vals = [int(tok) for tok in toks[1:]]
+    arity = {"odd_n": 0, "first_gcd": 1, "second_gcd": 1, "crt": 4, "above": 2, "witness": 3}
+    if kind not in arity:
+        return f"unknown certificate kind {kind!r}"
+    if len(vals) != arity[kind]:
+        return f"certificate {kind!r} expects {arity[kind]} values, got {len(vals)}"
+
+    if kind == "odd_n":
+        if n % 2 != 1:
+            return "odd_n certificate but n is even"
+        return "" if ans == -1 else "odd_n certificate but answer is not -1"
+
+    if n % 2 == 1:
+        return f"{kind} certificate but n is odd"
+
+    if kind == "witness":
+        A, B, step = vals
+        if A + B != ans:
+            return f"witness A+B={A + B} does not match answer {ans}"
+        if A < 0 or B < 0 or 2 * A + 4 * B != n:
+            return "witness does not satisfy 2A+4B=n with A,B>=0"
+        if A % c != 0 or B % d != 0 or (A + B) % p != 0:
+            return "witness violates a divisibility constraint"
+        m1, m2 = _reduced_moduli(n, c, d, p)
+        if step != m1 // math.gcd(m1, m2) * m2:
+            return "witness step is not the lcm of the congruence moduli"
+        # Every feasible fleet count is B/d + j*step; the next one must not fit.
+        if B // d + step <= n // (4 * d):
+            return "witness is not minimal: a larger fleet count fits"
+        return ""
+
+    if ans != -1:
+        return f"{kind} certificate proves impossibility but answer is {ans}"
+
+    if kind == "first_gcd":
+        (g,) = vals
+        if g != math.gcd(4 * d, 2 * c) or n % g == 0:
+            return "first_gcd certificate does not hold"
+        return ""
+
+    if kind == "second_gcd":
+        (g,) = vals
+        if g != math.gcd(d, p) or (n // 2) % g == 0:
+            return "second_gcd certificate does not hold"
+        return ""
+
+    m1, m2 = _reduced_moduli(n, c, d, p)
+    if kind == "crt":
+        r1, cert_m1, r2, cert_m2 = vals
+        if cert_m1 != m1 or cert_m2 != m2:
+            return "crt certificate moduli are wrong"
+        if (4 * d * r1 - n) % (2 * c) != 0 or (d * r2 - n // 2) % p != 0:
+            return "crt certificate residues do not solve their congruences"
+        if (r2 - r1) % math.gcd(m1, m2) == 0:
+            return "crt certificate residues are consistent"
+        return ""
+
+    r, step = vals
+    if step != m1 // math.gcd(m1, m2) * m2:
+        return "above certificate step is not the lcm of the congruence moduli"
+    if not (0 <= r < step) or not _solves_both(n, c, d, p, r):
+        return "above certificate residue is not the smallest solution"
+    if r <= n // (4 * d):
+        return "above certificate residue fits within n // (4d)"
+    return ""
+
+
+def check(input_text: str, output_text: str, certificate_text: Optional[str] = None) -> Tuple[bool, str]:
     # ---- Parse input ----
     try:
         in_tokens = input_text.split()
@@ -71,6 +176,10 @@ def check(input_text: str, output_text: str) -> Tuple[bool, str]:
     except Exception as e:
         return False, f"Input parsing error: {e}"
 
+    return _check_cases(t, iter(cases), output_text, certificate_text)
+
+
+def _check_cases(t: int, cases, output_text: str, certificate_text: Optional[str]) -> Tuple[bool, str]:
     # ---- Parse output strictly as t lines, 1 integer each ----
     try:
         lines = _split_lines_strict(output_text)
@@ -80,77 +189,298 @@ def check(input_text: str, output_text: str) -> Tuple[bool, str]:
     if len(lines) != t:
         return False, f"Expected exactly {t} lines of output, got {len(lines)}"
 
-    for i, line in enumerate(lines, start=1):
-        if line == "":
-            return False, f"Case {i}: empty line; expected one integer"
-        if line.strip() != line:
-            return False, f"Case {i}: leading/trailing whitespace is not allowed"
-        parts = line.split()
-        if len(parts) != 1:
-            return False, f"Case {i}: expected exactly 1 token on the line, got {len(parts)}"
-        tok = parts[0]
-        if not _is_int_token(tok):
-            return False, f"Case {i}: expected an integer, got {tok!r}"
+    cert_lines = None
+    if certificate_text is not None:
         try:
-            ans = _parse_int_token(tok)
+            cert_lines = _split_lines_strict(certificate_text)
         except Exception as e:
-            return False, f"Case {i}: integer parsing error: {e}"
+            return False, f"Certificate formatting error: {e}"
+        if len(cert_lines) != t:
+            return False, f"Expected exactly {t} certificate lines, got {len(cert_lines)}"
+
+    for i, line in enumerate(lines, start=1):
+        cert_line = None if cert_lines is None else cert_lines[i - 1]
+        reason = _check_case(i, next(cases), line, cert_line)
+        if reason:
+            return False, reason
+
+    return True, "OK"
+
+
+def _check_case(i: int, case: Tuple[int, int, int, int], line: str, cert_line: Optional[str]) -> str:
+    """
+    Validate output line i against its case; returns "" or the failure reason.
+    """
+    if line == "":
+        return f"Case {i}: empty line; expected one integer"
+    if line.strip() != line:
+        return f"Case {i}: leading/trailing whitespace is not allowed"
+    parts = line.split()
+    if len(parts) != 1:
+        return f"Case {i}: expected exactly 1 token on the line, got {len(parts)}"
+    tok = parts[0]
+    if not _is_int_token(tok):
+        return f"Case {i}: expected an integer, got {tok!r}"
+    try:
+        ans = _parse_int_token(tok)
+    except Exception as e:
+        return f"Case {i}: integer parsing error: {e}"
+
+    n, c, d, p = case
+
+    if cert_line is not None:
+        reason = _verify_certificate(n, c, d, p, ans, cert_line.split())
+        if reason:
+            return f"Case {i}: {reason}"
 
-        n, c, d, p = cases[i - 1]
+    # ---- Validations that do not require solving the optimization problem ----
 
-        # ---- Validations that do not require solving the optimization problem ----
+    # Necessary impossibility: 2A+4B is always even.
+    if n % 2 == 1:
+        if ans != -1:
+            return f"Case {i}: n is odd, so output must be -1, got {ans}"
+        return ""
 
-        # Necessary impossibility: 2A+4B is always even.
-        if n % 2 == 1:
-            if ans != -1:
-                return False, f"Case {i}: n is odd, so output must be -1, got {ans}"
-            continue
+    m = n // 2  # A + 2B = m
 
-        m = n // 2  # A + 2B = m
+    # Necessary impossibility: K=A+B is in [ceil(m/2), m], so if p > m then no positive multiple of p fits.
+    if p > m:
+        if ans != -1:
+            return f"Case {i}: p > n/2 implies impossible; output must be -1, got {ans}"
+        return ""
 
-        # Necessary impossibility: K=A+B is in [ceil(m/2), m], so if p > m then no positive multiple of p fits.
-        if p > m:
-            if ans != -1:
-                return False, f"Case {i}: p > n/2 implies impossible; output must be -1, got {ans}"
-            continue
+    if ans == -1:
+        # General impossibility cannot be verified without solving (or a certificate); accept -1 here.
+        return ""
 
-        if ans == -1:
-            # General impossibility cannot be verified without solving; accept -1 here.
-            continue
+    K = ans  # K = A+B
 
-        K = ans  # K = A+B
+    # K must be positive (since n>=1 implies m>=1 for even n, hence K>=ceil(m/2)>=1).
+    if K <= 0:
+        return f"Case {i}: output must be -1 or a positive integer, got {K}"
 
-        # K must be positive (since n>=1 implies m>=1 for even n, hence K>=ceil(m/2)>=1).
-        if K <= 0:
-            return False, f"Case {i}: output must be -1 or a positive integer, got {K}"
+    # Divisibility constraint.
+    if K % p != 0:
+        return f"Case {i}: (A+B) must be divisible by p={p}, got {K}"
 
-        # Divisibility constraint.
-        if K % p != 0:
-            return False, f"Case {i}: (A+B) must be divisible by p={p}, got {K}"
+    # Nonnegativity constraints translated into bounds on K.
+    K_min = (m + 1) // 2  # ceil(m/2)
+    K_max = m
+    if not (K_min <= K <= K_max):
+        return f"Case {i}: output K={K} is out of feasible range [{K_min}..{K_max}]"
 
-        # Nonnegativity constraints translated into bounds on K.
-        K_min = (m + 1) // 2  # ceil(m/2)
-        K_max = m
-        if not (K_min <= K <= K_max):
-            return False, f"Case {i}: output K={K} is out of feasible range [{K_min}..{K_max}]"
+    # Recover A,B uniquely from (A+2B=m, A+B=K):
+    B = m - K
+    A = 2 * K - m
 
-        # Recover A,B uniquely from (A+2B=m, A+B=K):
-        B = m - K
-        A = 2 * K - m
+    if A < 0 or B < 0:
+        return f"Case {i}: derived A={A}, B={B} must be nonnegative"
 
-        if A < 0 or B < 0:
-            return False, f"Case {i}: derived A={A}, B={B} must be nonnegative"
+    # Multiplicity constraints.
+    if A % c != 0:
+        return f"Case {i}: derived A={A} is not a multiple of c={c}"
+    if B % d != 0:
+        return f"Case {i}: derived B={B} is not a multiple of d={d}"
+
+    # Sanity check: ribbons equation.
+    if 2 * A + 4 * B != n:
+        return f"Case {i}: derived A,B do not satisfy 2A+4B=n (got {2*A + 4*B} vs {n})"
+
+    return ""
+
+
+def _iter_lines_strict(handle):
+    """
+    Streaming counterpart of _split_lines_strict over a binary file handle.
+    A trailing newline is consumed with its line; a second one shows up as
+    an extra empty line.
+    """
+    for raw in handle:
+        if raw.endswith(b"\n"):
+            raw = raw[:-1]
+            if raw.endswith(b"\r"):
+                raw = raw[:-1]
+        if b"\r" in raw:
+            raise ValueError("carriage return (\\r) is not allowed (use LF or CRLF newlines)")
+        yield raw.decode("utf-8")
+
+
+def _iter_raw_tokens(path: str):
+    for mapped, start, end in standard.iter_mapped_windows(path):
+        yield from mapped[start:end].split()
+
+
+def _take_lines(lines, count: int, label: str) -> Tuple[List[str], str]:
+    taken: List[str] = []
+    try:
+        for line in islice(lines, count):
+            taken.append(line)
+    except ValueError as e:
+        return taken, f"{label} formatting error: {e}"
+    return taken, ""
+
+
+def _count_rest(items) -> Tuple[int, str]:
+    count = 0
+    try:
+        for _ in items:
+            count += 1
+    except ValueError as e:
+        return count, str(e)
+    return count, ""
+
+
+def _iter_chunks(t: int, tokens, lines, cert_lines, chunk_size: int):
+    """
+    Walk input tokens, output lines and certificate lines in lockstep.
+
+    Yields (first_case, input_tokens, output_lines, certificate_lines,
+    problem): the raw data of up to chunk_size consecutive complete cases,
+    then a structural problem ("" if none) that applies only once every case
+    of the chunk has passed. Stops after the first chunk with a problem.
+    """
+    case_id = 1
+    while case_id <= t:
+        size = min(chunk_size, t - case_id + 1)
+        in_tokens = list(islice(tokens, 4 * size))
+        out_lines, out_problem = _take_lines(lines, size, "Output")
+        certs, cert_problem = [], ""
+        if cert_lines is not None:
+            certs, cert_problem = _take_lines(cert_lines, size, "Certificate")
+
+        # Each short stream fails at the first case it cannot supply.
+        problems = []
+        if len(in_tokens) < 4 * size:
+            problems.append((len(in_tokens) // 4, f"Input: case {case_id + len(in_tokens) // 4} is incomplete"))
+        if out_problem or len(out_lines) < size:
+            problems.append((len(out_lines), out_problem or (
+                f"Expected exactly {t} lines of output, got {case_id - 1 + len(out_lines)}")))
+        if cert_lines is not None and (cert_problem or len(certs) < size):
+            problems.append((len(certs), cert_problem or (
+                f"Expected exactly {t} certificate lines, got {case_id - 1 + len(certs)}")))
+        if problems:
+            complete, problem = min(problems, key=lambda item: item[0])
+            yield (
+                case_id,
+                in_tokens[:4 * complete],
+                out_lines[:complete],
+                None if cert_lines is None else certs[:complete],
+                problem,
+            )
+            return
+
+        yield case_id, in_tokens, out_lines, None if cert_lines is None else certs, ""
+        case_id += size
+
+    problem = ""
+    extra_tokens = sum(1 for _ in tokens)
+    if extra_tokens:
+        problem = f"Input: expected {1 + 4 * t} tokens (t + 4*t), got {1 + 4 * t + extra_tokens}"
+    else:
+        extra_lines, error = _count_rest(lines)
+        if error:
+            problem = f"Output formatting error: {error}"
+        elif extra_lines:
+            problem = f"Expected exactly {t} lines of output, got {t + extra_lines}"
+        elif cert_lines is not None:
+            extra_lines, error = _count_rest(cert_lines)
+            if error:
+                problem = f"Certificate formatting error: {error}"
+            elif extra_lines:
+                problem = f"Expected exactly {t} certificate lines, got {t + extra_lines}"
+    if problem:
+        yield case_id, [], [], None, problem
+
+
+def _check_chunk(first_case: int, in_tokens: List[bytes], out_lines: List[str], cert_lines: Optional[List[str]]) -> str:
+    """
+    Validate one chunk from _iter_chunks; returns "" or the first failure.
+    """
+    if b"".join(in_tokens).isdigit():
+        # Fast path: every token is plain ASCII digits.
+        values = list(map(int, in_tokens))
+    else:
+        values = []
+        for offset, tok in enumerate(raw.decode("utf-8", "replace") for raw in in_tokens):
+            if not _is_int_token(tok):
+                return f"Input: case {first_case + offset // 4}, token {offset % 4 + 1} is not an integer: {tok!r}"
+            values.append(int(tok))
+
+    cases = zip(*[iter(values)] * 4)
+    if cert_lines is None:
+        cert_lines = [None] * len(out_lines)
+    for i, (case, line, cert_line) in enumerate(zip(cases, out_lines, cert_lines), start=first_case):
+        reason = _check_case(i, case, line, cert_line)
+        if reason:
+            return reason
+    return ""
+
+
+def check_files(
+    in_path: str,
+    out_path: str,
+    cert_path: Optional[str] = None,
+    workers: int = 1,
+    chunk_size: int = CHECK_CHUNK_SIZE,
+) -> Tuple[bool, str]:
+    """
+    Streaming checker: walks the input (memory-mapped), the output and the
+    optional certificates in lockstep, so memory is bounded by a few chunks
+    of chunk_size cases.
+
+    With workers > 1, chunks are validated across a process pool while the
+    main process keeps reading; results are consumed in case order, so the
+    reported failure is always the first failing case, exactly as with one
+    worker. Unlike check, a malformed case can be reported before a line
+    count mismatch further down the files.
+    """
+    try:
+        tokens = _iter_raw_tokens(in_path)
+        first = next(tokens, None)
+        if first is None:
+            return False, "Input is empty"
+        first = first.decode("utf-8", "replace")
+        if not _is_int_token(first):
+            return False, f"Input: t is not a valid integer token: {first!r}"
+        t = int(first)
+        if t < 1:
+            return False, f"Input: t must be >= 1, got {t}"
+    except Exception as e:
+        return False, f"Input parsing error: {e}"
 
-        # Multiplicity constraints.
-        if A % c != 0:
-            return False, f"Case {i}: derived A={A} is not a multiple of c={c}"
-        if B % d != 0:
-            return False, f"Case {i}: derived B={B} is not a multiple of d={d}"
+    with ExitStack() as stack:
+        lines = _iter_lines_strict(stack.enter_context(open(out_path, "rb")))
+        cert_lines = None
+        if cert_path:
+            cert_lines = _iter_lines_strict(stack.enter_context(open(cert_path, "rb")))
+        chunks = _iter_chunks(t, tokens, lines, cert_lines, chunk_size)
 
-        # Sanity check: ribbons equation.
-        if 2 * A + 4 * B != n:
-            return False, f"Case {i}: derived A,B do not satisfy 2A+4B=n (got {2*A + 4*B} vs {n})"
+        if workers <= 1:
+            for first_case, in_tokens, out_lines, certs, problem in chunks:
+                reason = _check_chunk(first_case, in_tokens, out_lines, certs) or problem
+                if reason:
+                    return False, reason
+            return True, "OK"
 
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: deque = deque()
+            try:
+                for chunk in chunks:
+                    pending.append((executor.submit(_check_chunk, *chunk[:4]), chunk[4]))
+                    # Keep a bounded number of chunks in flight.
+                    while len(pending) > workers * CHUNKS_PER_WORKER or (pending and pending[0][0].done()):
+                        future, problem = pending.popleft()
+                        reason = future.result() or problem
+                        if reason:
+                            return False, reason
+                while pending:
+                    future, problem = pending.popleft()
+                    reason = future.result() or problem
+                    if reason:
+                        return False, reason
+            finally:
+                for future, _ in pending:
+                    future.cancel()
     return True, "OK"
 
 
@@ -159,9 +489,10 @@ if __name__ == "__main__":
     out_path = os.environ.get("OUTPUT_PATH")
     if not in_path or not out_path:
         raise SystemExit("Environment variables INPUT_PATH and OUTPUT_PATH are required")
-    with open(in_path, "r", encoding="utf-8", newline="") as f:
-        input_text_ = f.read()
-    with open(out_path, "r", encoding="utf-8", newline="") as f:
-        output_text_ = f.read()
-    ok, _reason = check(input_text_, output_text_)
+    ok, _reason = check_files(
+        in_path,
+        out_path,
+        os.environ.get("CERTIFICATE_PATH"),
+        workers=int(os.environ.get("CHECKER_WORKERS", "1")),
+    )
     print("True" if ok else "False")
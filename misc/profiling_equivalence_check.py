@@ -0,0 +1,74 @@
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOLVER_PATH = os.path.join(ROOT_DIR, "standard.py")
+TEST_CASES_DIR = os.path.join(ROOT_DIR, "test_cases")
+PROFILE_ENV = "KITE_PROFILE"
+
+
+def run_solver(input_path: str, solver_args, profile_path=None) -> bytes:
+    """
+    Run standard.py on one input file and return its stdout, with stage
+    profiling written to profile_path when it is given.
+    """
+    env = dict(os.environ)
+    env.pop(PROFILE_ENV, None)
+    if profile_path is not None:
+        env[PROFILE_ENV] = profile_path
+    with open(input_path, "rb") as source:
+        return subprocess.run(
+            [sys.executable, SOLVER_PATH, *solver_args],
+            stdin=source,
+            stdout=subprocess.PIPE,
+            env=env,
+            check=True,
+        ).stdout
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Check that standard.py writes byte-identical answers with and without KITE_PROFILE."
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="input files (default: every test_cases/*.in)",
+    )
+    parser.add_argument(
+        "--solver-args",
+        default="",
+        help="extra standard.py arguments, space-separated (e.g. \"--batch 64\")",
+    )
+    args = parser.parse_args(argv)
+    inputs = args.inputs or sorted(glob.glob(os.path.join(TEST_CASES_DIR, "*.in")))
+    if not inputs:
+        parser.error("no input files")
+    solver_args = args.solver_args.split()
+
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as directory:
+        profile_path = os.path.join(directory, "profile.json")
+        for input_path in inputs:
+            plain = run_solver(input_path, solver_args)
+            profiled = run_solver(input_path, solver_args, profile_path)
+            if plain != profiled:
+                mismatches += 1
+                print(f"{input_path}: profiled output differs")
+            elif not os.path.exists(profile_path):
+                mismatches += 1
+                print(f"{input_path}: no profile written")
+            if os.path.exists(profile_path):
+                os.remove(profile_path)
+
+    print(f"{len(inputs) - mismatches}/{len(inputs)} inputs identical with profiling on")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
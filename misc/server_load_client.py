@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+MISC_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(MISC_DIR))
+sys.path.insert(0, MISC_DIR)
+
+import kite_server  # noqa: E402
+import stress_corpus_generator  # noqa: E402
+from standard import minimum_kites  # noqa: E402
+
+DEFAULT_CONNECTIONS = 64
+DEFAULT_REQUESTS = 200
+DEFAULT_CASES_PER_REQUEST = 4
+SEED = 20240715
+
+
+def percentile(sorted_values: list, q: float):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def open_connection(args):
+    if args.unix is not None:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def run_connection(args, requests: list, latencies: list) -> int:
+    """
+    Send requests one at a time over one connection, timing each round trip.
+
+    Returns:
+        The number of answers that differ from minimum_kites (0 unless
+        --verify is given).
+    """
+    reader, writer = await open_connection(args)
+    mismatches = 0
+    clock = time.perf_counter_ns
+    try:
+        for cases in requests:
+            payload = f"{len(cases)}\n" + "".join("%d %d %d %d\n" % case for case in cases)
+            began = clock()
+            writer.write(payload.encode())
+            await writer.drain()
+            answers = [int(await reader.readline()) for _ in cases]
+            latencies.append(clock() - began)
+            if args.verify:
+                mismatches += sum(
+                    answer != minimum_kites(*case) for case, answer in zip(cases, answers)
+                )
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return mismatches
+
+
+async def run_load(args) -> dict:
+    mix = stress_corpus_generator.parse_mix(args.mix)
+    per_request = args.cases_per_request
+    cases = stress_corpus_generator.iter_cases(
+        args.connections * args.requests * per_request, args.seed, mix
+    )
+    plans = [
+        [[next(cases) for _ in range(per_request)] for _ in range(args.requests)]
+        for _ in range(args.connections)
+    ]
+
+    latencies: list = []
+    began = time.perf_counter()
+    mismatches = await asyncio.gather(
+        *(run_connection(args, requests, latencies) for requests in plans)
+    )
+    elapsed = time.perf_counter() - began
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "qps": len(latencies) * per_request / elapsed,
+        "p50_us": percentile(latencies, 0.50) / 1000,
+        "p99_us": percentile(latencies, 0.99) / 1000,
+        "max_us": latencies[-1] / 1000,
+        "mismatches": sum(mismatches),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Drive kite_server.py with concurrent connections and report latency."
+    )
+    parser.add_argument("--host", default=kite_server.DEFAULT_HOST, help="server TCP address")
+    parser.add_argument("--port", type=int, default=kite_server.DEFAULT_PORT, help="server TCP port")
+    parser.add_argument("--unix", metavar="PATH", help="connect to this Unix socket instead of TCP")
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=DEFAULT_CONNECTIONS,
+        help="concurrent client connections",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=DEFAULT_REQUESTS,
+        help="requests sent by each connection, one in flight at a time",
+    )
+    parser.add_argument(
+        "--cases-per-request",
+        type=int,
+        default=DEFAULT_CASES_PER_REQUEST,
+        help="test cases in each request",
+    )
+    parser.add_argument(
+        "--mix",
+        default=stress_corpus_generator.DEFAULT_MIX,
+        help="stress_corpus_generator family mix of the cases",
+    )
+    parser.add_argument("--seed", type=int, default=SEED, help="random seed")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="check every answer against minimum_kites",
+    )
+    args = parser.parse_args(argv)
+
+    if min(args.connections, args.requests, args.cases_per_request) < 1:
+        parser.error("--connections, --requests and --cases-per-request must be at least 1")
+    try:
+        stress_corpus_generator.parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    report = asyncio.run(run_load(args))
+    print(
+        f"{report['requests']} requests in {report['seconds']:.2f}s:"
+        f" {report['rps']:.0f} req/s, {report['qps']:.0f} cases/s;"
+        f" latency p50 {report['p50_us']:.0f} us p99 {report['p99_us']:.0f} us"
+        f" max {report['max_us']:.0f} us"
+    )
+    if args.verify:
+        print(f"{report['mismatches']} mismatched answers")
+        if report["mismatches"]:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import small_table  # noqa: E402
+import standard  # noqa: E402
+
+DEFAULT_BOUND = 16
+# Residue offsets are uint32 and residues (below 2c * p) int16; past this
+# bound the offsets overflow first.
+MAX_BOUND = 96
+DEFAULT_OUTPUT = os.path.join(ROOT_DIR, "small_table.bin")
+
+
+def merged_residues(carton_size: int, fleet_size: int, parade_modulus: int) -> tuple:
+    """
+    Merged residue of minimum_kites for every even n below the triple's period.
+
+    Applies the SolverPlan arithmetic to all even n in [0, lcm(2c, 2p)) at
+    once.
+
+    Returns:
+        (period, merged_modulus, residues) with residues an int16 array of
+        r for n = 0, 2, 4, ... and -1 where there is no solution.
+    """
+    plan = standard.SolverPlan(carton_size, fleet_size, parade_modulus)
+    period = math.lcm(2 * carton_size, 2 * parade_modulus)
+    n_ribbons = np.arange(0, period, 2, dtype=np.int64)
+    half_ribbons = n_ribbons // 2
+
+    solvable = (n_ribbons % plan.first_gcd == 0) & (half_ribbons % plan.second_gcd == 0)
+    first_residue = (
+        (n_ribbons % plan.first_full_modulus) // plan.first_gcd
+        * plan.first_inverse
+        % plan.first_modulus
+    )
+    second_residue = (
+        (half_ribbons % plan.parade_modulus) // plan.second_gcd
+        * plan.second_inverse
+        % plan.second_modulus
+    )
+    residue_difference = second_residue - first_residue
+    solvable &= residue_difference % plan.merge_gcd == 0
+    multiplier = (
+        residue_difference // plan.merge_gcd
+        * plan.merge_inverse
+        % plan.second_modulus_reduced
+    )
+    residues = first_residue + plan.first_modulus * multiplier
+    residues[~solvable] = -1
+    return period, plan.merged_modulus, residues.astype("<i2")
+
+
+def build_table(bound: int, path: str) -> dict:
+    """
+    Write the small-parameter table of every (c, d, p) in [1, bound]^3.
+
+    Returns:
+        Dict with the triple count, residue count and file size in bytes.
+    """
+    triple_count = bound**3
+    entries = np.zeros((triple_count, 3), dtype="<u4")
+    residue_count = 0
+    with open(path, "wb") as f:
+        f.write(small_table.HEADER.pack(small_table.MAGIC, bound))
+        f.write(entries.tobytes())
+        index = 0
+        for carton_size in range(1, bound + 1):
+            for fleet_size in range(1, bound + 1):
+                for parade_modulus in range(1, bound + 1):
+                    period, merged_modulus, residues = merged_residues(
+                        carton_size, fleet_size, parade_modulus
+                    )
+                    entries[index] = (residue_count, period, merged_modulus)
+                    f.write(residues.tobytes())
+                    residue_count += residues.size
+                    index += 1
+        f.seek(small_table.HEADER.size)
+        f.write(entries.tobytes())
+    return {
+        "triples": triple_count,
+        "residues": residue_count,
+        "bytes": os.path.getsize(path),
+    }
+
+
+def measure(cases: list, table: small_table.SmallParameterTable) -> dict:
+    """
+    Hit rate of the table on a corpus, and time of minimum_kites against
+    minimum_kites_tabled over the whole corpus and over its table hits.
+    """
+    hits = [case for case in cases if table.covers(*case[1:])]
+    report = {"cases": len(cases), "hit_rate": len(hits) / len(cases) if cases else 0.0}
+    for scope, subset in (("all", cases), ("hits", hits)):
+        for name, solver in (
+            ("general", standard.minimum_kites),
+            ("tabled", standard.minimum_kites_tabled),
+        ):
+            began = time.perf_counter()
+            for case in subset:
+                solver(*case)
+            report[f"{scope}_{name}_seconds"] = time.perf_counter() - began
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build the memory-mapped small-parameter table for minimum_kites_tabled."
+    )
+    parser.add_argument(
+        "--bound",
+        type=int,
+        default=DEFAULT_BOUND,
+        help=f"cover every c, d, p up to this value (at most {MAX_BOUND})",
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="table file to write")
+    parser.add_argument(
+        "--corpus",
+        help="input file on which to report the table's hit rate and speed",
+    )
+    args = parser.parse_args(argv)
+    if not 1 <= args.bound <= MAX_BOUND:
+        parser.error(f"--bound must be between 1 and {MAX_BOUND}")
+
+    began = time.perf_counter()
+    size = build_table(args.bound, args.output)
+    print(
+        f"{args.output}: {size['triples']} triples, {size['residues']} residues,"
+        f" {size['bytes']} bytes, built in {time.perf_counter() - began:.1f}s"
+    )
+
+    if args.corpus is not None:
+        table = standard.load_small_table(args.output)
+        report = measure(list(standard.iter_mapped_test_cases(args.corpus)), table)
+        print(f"{args.corpus}: {report['cases']} cases, hit rate {report['hit_rate']:.1%}")
+        for scope in ("all", "hits"):
+            print(
+                f"  {scope:<4} general {report[f'{scope}_general_seconds']:.3f}s,"
+                f" tabled {report[f'{scope}_tabled_seconds']:.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
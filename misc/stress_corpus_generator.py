@@ -0,0 +1,227 @@
+import argparse
+import math
+import random
+import sys
+
+N_MAX = 10**18
+CD_MAX = 10**9
+P_MAX = 10**18
+WRITE_BATCH_SIZE = 4096
+DEFAULT_MIX = "odd_n=1,p_above_half=1,gcd_trap=1,crt_overflow=1,feasible=2,repeated=4,distinct=2"
+DEFAULT_TRIPLE_POOL = 64
+
+
+def random_even(rng: random.Random, low: int, high: int) -> int:
+    return 2 * rng.randint((low + 1) // 2, high // 2)
+
+
+def odd_n(rng: random.Random, pool) -> tuple:
+    """
+    Odd n: every solver exits on the parity check.
+    """
+    return (
+        2 * rng.randint(0, (N_MAX - 1) // 2) + 1,
+        rng.randint(1, CD_MAX),
+        rng.randint(1, CD_MAX),
+        rng.randint(1, P_MAX),
+    )
+
+
+def p_above_half(rng: random.Random, pool) -> tuple:
+    """
+    Even n with p > n/2, so no positive multiple of p fits in A + B.
+    """
+    n_ribbons = random_even(rng, 2, N_MAX)
+    return (
+        n_ribbons,
+        rng.randint(1, CD_MAX),
+        rng.randint(1, CD_MAX),
+        rng.randint(n_ribbons // 2 + 1, P_MAX),
+    )
+
+
+def gcd_trap(rng: random.Random, pool) -> tuple:
+    """
+    Even n where one congruence has no solution: gcd(4d, 2c) does not divide
+    n, or gcd(d, p) does not divide n/2. The moduli share large factors so
+    the gcds are not trivially 1 or 2.
+    """
+    shared = rng.randint(2, 10**6)
+    carton_size = shared * rng.randint(1, CD_MAX // shared)
+    fleet_size = shared * rng.randint(1, CD_MAX // shared)
+    parade_modulus = shared * rng.randint(1, 10**6)
+    first_gcd = math.gcd(4 * fleet_size, 2 * carton_size)
+    second_gcd = math.gcd(fleet_size, parade_modulus)
+    if rng.random() < 0.5 or (first_gcd // 2) % second_gcd == 0:
+        n_ribbons = random_even(rng, 2, N_MAX)
+        if n_ribbons % first_gcd == 0:
+            n_ribbons -= 2
+    else:
+        # Pass the first gcd test and fail the second one: n/2 is a multiple
+        # of first_gcd/2, and stepping down one multiple leaves the residue
+        # class of second_gcd if it was in it.
+        n_ribbons = first_gcd * rng.randint(2, N_MAX // first_gcd)
+        if (n_ribbons // 2) % second_gcd == 0:
+            n_ribbons -= first_gcd
+    return max(n_ribbons, 2), carton_size, fleet_size, parade_modulus
+
+
+def coprime_to(rng: random.Random, low: int, high: int, *others: int) -> int:
+    while True:
+        value = rng.randint(low, high)
+        if all(math.gcd(value, other) == 1 for other in others):
+            return value
+
+
+def crt_overflow(rng: random.Random, pool) -> tuple:
+    """
+    Odd c near 1e9, and p near 1e18 coprime to both c and d. The merged CRT
+    modulus is about c * p, close to 1e27, far beyond 64-bit intermediates.
+    """
+    carton_size = coprime_to(rng, CD_MAX // 2, CD_MAX, 2)
+    fleet_size = coprime_to(rng, 1, CD_MAX, carton_size)
+    parade_modulus = coprime_to(rng, P_MAX // 10, P_MAX // 2, carton_size, fleet_size)
+    return (
+        random_even(rng, 2 * parade_modulus, N_MAX),
+        carton_size,
+        fleet_size,
+        parade_modulus,
+    )
+
+
+def feasible(rng: random.Random, pool) -> tuple:
+    """
+    A case built around a known valid shipment, so the full CRT path runs to
+    a real answer.
+    """
+    carton_size = rng.randint(1, CD_MAX)
+    fleet_size = rng.randint(1, CD_MAX)
+    twin_tails = carton_size * rng.randint(0, N_MAX // 4 // carton_size)
+    quad_tails = fleet_size * rng.randint(0, N_MAX // 8 // fleet_size)
+    if twin_tails + quad_tails == 0:
+        twin_tails = carton_size
+    parade_modulus = math.gcd(twin_tails + quad_tails, rng.randint(1, P_MAX))
+    return 2 * twin_tails + 4 * quad_tails, carton_size, fleet_size, parade_modulus
+
+
+def random_triple(rng: random.Random) -> tuple:
+    return (
+        rng.randint(1, CD_MAX),
+        rng.randint(1, CD_MAX),
+        rng.randint(1, rng.choice((10**3, 10**9, P_MAX))),
+    )
+
+
+def repeated(rng: random.Random, pool) -> tuple:
+    """
+    Even n over a small fixed pool of (c, d, p): the plan-cache hit path.
+    """
+    return (random_even(rng, 2, N_MAX),) + rng.choice(pool)
+
+
+def distinct(rng: random.Random, pool) -> tuple:
+    """
+    Even n with a fresh (c, d, p) per case: the plan-cache miss path.
+    """
+    return (random_even(rng, 2, N_MAX),) + random_triple(rng)
+
+
+FAMILIES = {
+    "odd_n": odd_n,
+    "p_above_half": p_above_half,
+    "gcd_trap": gcd_trap,
+    "crt_overflow": crt_overflow,
+    "feasible": feasible,
+    "repeated": repeated,
+    "distinct": distinct,
+}
+
+
+def parse_mix(text: str) -> dict:
+    """
+    Parse "family=weight,..." into {family: weight}.
+
+    Raises:
+        ValueError: On unknown families or negative weights.
+    """
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in FAMILIES:
+            raise ValueError(f"unknown family {name!r}; choose from {', '.join(FAMILIES)}")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] < 0:
+            raise ValueError(f"weight of {name!r} must be nonnegative")
+    if not any(mix.values()):
+        raise ValueError("at least one family needs a positive weight")
+    return mix
+
+
+def iter_cases(case_count: int, seed: int, mix: dict, triple_pool: int = DEFAULT_TRIPLE_POOL):
+    """
+    Yield case_count reproducible (n, c, d, p) cases drawn from the mix.
+
+    The same (case_count, seed, mix, triple_pool) always yields the same
+    cases, independent of how the output is written.
+    """
+    rng = random.Random(seed)
+    pool = [random_triple(rng) for _ in range(triple_pool)]
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    generators = [FAMILIES[name] for name in names]
+    produced = 0
+    while produced < case_count:
+        block = min(WRITE_BATCH_SIZE, case_count - produced)
+        for generator in rng.choices(generators, weights, k=block):
+            yield generator(rng, pool)
+        produced += block
+
+
+def write_corpus(stream, case_count: int, seed: int, mix: dict, triple_pool: int = DEFAULT_TRIPLE_POOL) -> None:
+    stream.write(f"{case_count}\n")
+    batch = []
+    for case in iter_cases(case_count, seed, mix, triple_pool):
+        batch.append("%d %d %d %d\n" % case)
+        if len(batch) >= WRITE_BATCH_SIZE:
+            stream.write("".join(batch))
+            batch.clear()
+    stream.write("".join(batch))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a seeded stress corpus of test cases.")
+    parser.add_argument("--cases", type=int, default=1_000_000, help="number of test cases")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"comma-separated family=weight list over: {', '.join(FAMILIES)}",
+    )
+    parser.add_argument(
+        "--triple-pool",
+        type=int,
+        default=DEFAULT_TRIPLE_POOL,
+        help="number of distinct (c, d, p) triples the 'repeated' family draws from",
+    )
+    parser.add_argument("--output", help="write to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.cases < 1:
+        parser.error("--cases must be at least 1")
+    if args.triple_pool < 1:
+        parser.error("--triple-pool must be at least 1")
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.output is None:
+        write_corpus(sys.stdout, args.cases, args.seed, mix, args.triple_pool)
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="\n") as f:
+            write_corpus(f, args.cases, args.seed, mix, args.triple_pool)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,183 @@
 
-import sys
+import argparse
+import os
 import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standard import shard_boundaries  # noqa: E402
+
+READ_CHUNK_SIZE = 1 << 18
+SHARDS_PER_WORKER = 4
+# Four tokens of at most 4300 digits (int()'s default limit) plus separators;
+# a longer unterminated line can never be valid.
+MAX_LINE_BYTES = 1 << 16
+
+INT_LINE = re.compile(r"[0-9]+")
+# Exactly 4 non-negative integer tokens separated by single spaces, no leading/trailing spaces
+CASE_LINE = re.compile(r"[0-9]+ [0-9]+ [0-9]+ [0-9]+")
+# The first line, ended by LF, CRLF or a bare CR like str.splitlines would.
+T_LINE = re.compile(rb"([0-9]+)(\r\n|\r|\n)")
+# A run of complete case lines; an empty line can never match.
+CASE_BLOCK = re.compile(rb"(?:[0-9]+ [0-9]+ [0-9]+ [0-9]+(?:\r\n|\r|\n))*")
+
 
 def valid_int_line(line: str) -> bool:
-    return re.fullmatch(r"[0-9]+", line) is not None
+    return INT_LINE.fullmatch(line) is not None
 
 def valid_4ints_line(line: str) -> bool:
-    # Exactly 4 non-negative integer tokens separated by single spaces, no leading/trailing spaces
-    return re.fullmatch(r"[0-9]+ [0-9]+ [0-9]+ [0-9]+", line) is not None
-
-def main():
-    data = sys.stdin.read()
-    if data == "":
-        print("False")
-        return
-
-    lines = data.splitlines()
-    # Reject any empty line (strict line formatting)
-    lines = [ln.rstrip("\r") for ln in lines]
-    if any(ln == "" for ln in lines):
-        print("False")
-        return
-
-    if not valid_int_line(lines[0]):
-        print("False")
-        return
+    return CASE_LINE.fullmatch(line) is not None
+
+def validate_block(block: bytes) -> int:
+    """
+    Check a run of terminated case lines in one pass: the format with a single
+    regex match, then the bounds column by column.
 
+    Returns the number of case lines, or -1 if any line is invalid.
+    """
+    if CASE_BLOCK.fullmatch(block) is None:
+        return -1
     try:
-        t = int(lines[0])
-    except:
-        print("False")
-        return
-
-    if t < 1:
-        print("False")
-        return
-
-    if len(lines) != t + 1:
-        print("False")
-        return
-
-    for i in range(1, t + 1):
-        ln = lines[i]
-        if not valid_4ints_line(ln):
-            print("False")
-            return
-        try:
-            n_str, c_str, d_str, p_str = ln.split(" ")
-            n = int(n_str)
-            c = int(c_str)
-            d = int(d_str)
-            p = int(p_str)
-        except:
-            print("False")
-            return
-
-        if not (1 <= n <= 10**18):
-            print("False")
-            return
-        if not (1 <= c <= 10**9):
-            print("False")
-            return
-        if not (1 <= d <= 10**9):
-            print("False")
-            return
-        if not (1 <= p <= 10**18):
-            print("False")
-            return
-
-    print("True")
+        values = list(map(int, block.split()))
+    except ValueError:
+        return -1
+    if not values:
+        return 0
+    for column, upper in enumerate((10**18, 10**9, 10**9, 10**18)):
+        column_values = values[column::4]
+        if min(column_values) < 1 or max(column_values) > upper:
+            return -1
+    return len(values) // 4
+
+def validate_stream(stream, size=None, carry: bytes = b"") -> int:
+    """
+    Validate the case lines of a binary stream chunk by chunk, holding at most
+    one chunk plus one partial line in memory.
+
+    Args:
+        stream: Binary file-like object positioned at a line start.
+        size: Number of bytes to read, or None to read to EOF.
+        carry: Bytes already read from the stream that precede it.
+
+    Returns:
+        The number of case lines, or -1 if any line is invalid.
+    """
+    total = 0
+    while True:
+        want = READ_CHUNK_SIZE if size is None else min(READ_CHUNK_SIZE, size)
+        chunk = stream.read(want) if want else b""
+        if not chunk:
+            break
+        if size is not None:
+            size -= len(chunk)
+        data = carry + chunk
+        # Cut after the last terminator; a CR at the very end may be the
+        # first half of a CRLF, so it stays in the carry.
+        cut = max(data.rfind(b"\n"), data.rfind(b"\r", 0, len(data) - 1)) + 1
+        carry = data[cut:]
+        if len(carry) > MAX_LINE_BYTES:
+            return -1
+        if cut:
+            count = validate_block(data[:cut])
+            if count < 0:
+                return -1
+            total += count
+
+    if carry:
+        if not carry.endswith((b"\n", b"\r")):
+            carry += b"\n"
+        count = validate_block(carry)
+        if count < 0:
+            return -1
+        total += count
+    return total
+
+def validate_range(path: str, start: int, end: int) -> int:
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        return validate_stream(handle, end - start)
+
+def read_t_line(stream):
+    """
+    Read and parse the first line.
+
+    Returns (t, rest, terminator) with rest the bytes read past the line, or
+    None if the line is malformed.
+    """
+    head = stream.read(READ_CHUNK_SIZE)
+    match = T_LINE.match(head)
+    if match is None:
+        return None
+    try:
+        t = int(match.group(1))
+    except ValueError:
+        return None
+    rest = head[match.end():]
+    terminator = match.group(2)
+    if terminator == b"\r" and not rest:
+        rest = stream.read(1)
+        if rest == b"\n":
+            rest, terminator = b"", b"\r\n"
+    return t, rest, terminator
+
+def validate_file(path: str, workers: int) -> bool:
+    with open(path, "rb") as handle:
+        parsed = read_t_line(handle)
+        if parsed is None or parsed[0] < 1:
+            return False
+        t, rest, terminator = parsed
+        if workers <= 1 or not terminator.endswith(b"\n"):
+            return validate_stream(handle, carry=rest) == t
+
+    # shard_boundaries splits after LF bytes, so CRLF pairs stay in one shard.
+    shards = shard_boundaries(path, workers * SHARDS_PER_WORKER)
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for count in executor.map(
+            validate_range,
+            [path] * len(shards),
+            [start for start, _ in shards],
+            [end for _, end in shards],
+        ):
+            if count < 0:
+                return False
+            total += count
+    return total == t
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kite Ribbon Ledger input validator.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="validate byte-range shards of the input on this many processes",
+    )
+    parser.add_argument(
+        "--input",
+        help="validate this file instead of stdin",
+    )
+    args = parser.parse_args(argv)
+
+    if args.input is not None:
+        ok = validate_file(args.input, args.workers)
+    elif args.workers > 1:
+        with tempfile.NamedTemporaryFile(suffix=".in") as spool:
+            shutil.copyfileobj(sys.stdin.buffer, spool)
+            spool.flush()
+            ok = validate_file(spool.name, args.workers)
+    else:
+        parsed = read_t_line(sys.stdin.buffer)
+        ok = (
+            parsed is not None
+            and parsed[0] >= 1
+            and validate_stream(sys.stdin.buffer, carry=parsed[1]) == parsed[0]
+        )
+
+    print("True" if ok else "False")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,85 @@
+from array import array
+
+from standard import get_backend, modular_inverse, solve_linear_congruence
+
+
+def sweep_parade_sizes(
+    n_ribbons: int,
+    carton_size: int,
+    fleet_size: int,
+    parade_moduli,
+) -> array:
+    """
+    Compute minimum_kites(n, c, d, p) for one (n, c, d) and many p.
+
+    The first congruence B/d ≡ r (mod m) does not depend on p and is solved
+    once. Writing B/d = r + m * j turns the second congruence into
+    d * m * j ≡ n/2 - d * r (mod p), whose coefficient and right-hand side
+    are also fixed, so each p costs one gcd and one inverse and needs no
+    CRT merge.
+
+    Args:
+        n_ribbons: Total number of ribbons n.
+        carton_size: TwinTail batch size c.
+        fleet_size: QuadTail batch size d.
+        parade_moduli: Sequence of divisibility requirements p.
+
+    Returns:
+        array('q') of answers aligned with parade_moduli (-1 if impossible).
+    """
+    sweep_size = len(parade_moduli)
+    if n_ribbons % 2 != 0:
+        return array("q", [-1]) * sweep_size
+
+    half_ribbons = n_ribbons // 2
+    maximum_fleets = n_ribbons // (4 * fleet_size)
+    if maximum_fleets == 0:
+        if half_ribbons % carton_size != 0:
+            return array("q", [-1]) * sweep_size
+        return array("q", [
+            half_ribbons if half_ribbons % parade_modulus == 0 else -1
+            for parade_modulus in parade_moduli
+        ])
+
+    first_solution = solve_linear_congruence(
+        4 * fleet_size,
+        n_ribbons,
+        2 * carton_size,
+    )
+    if first_solution is None or first_solution[0] > maximum_fleets:
+        return array("q", [-1]) * sweep_size
+    first_residue, first_modulus = first_solution
+
+    # B/d = first_residue + first_modulus * j with 0 <= j <= maximum_steps.
+    maximum_steps = (maximum_fleets - first_residue) // first_modulus
+    coefficient = fleet_size * first_modulus
+    right_side = half_ribbons - fleet_size * first_residue
+    gcd = get_backend().gcd
+
+    answers = array("q")
+    append = answers.append
+    for parade_modulus in parade_moduli:
+        if 0 < half_ribbons < parade_modulus:
+            append(-1)
+            continue
+        reduced_coefficient = coefficient % parade_modulus
+        reduced_right = right_side % parade_modulus
+        gcd_value = gcd(reduced_coefficient, parade_modulus)
+        if reduced_right % gcd_value != 0:
+            append(-1)
+            continue
+        step_modulus = parade_modulus // gcd_value
+        if step_modulus == 1:
+            best_step = maximum_steps
+        else:
+            first_step = (
+                reduced_right // gcd_value
+                * modular_inverse(reduced_coefficient // gcd_value, step_modulus)
+                % step_modulus
+            )
+            if first_step > maximum_steps:
+                append(-1)
+                continue
+            best_step = first_step + (maximum_steps - first_step) // step_modulus * step_modulus
+        append(half_ribbons - fleet_size * (first_residue + first_modulus * best_step))
+    return answers
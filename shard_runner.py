@@ -0,0 +1,319 @@
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from standard import READ_CHUNK_SIZE, shard_boundaries
+
+SOLVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "standard.py")
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+class ShardError(Exception):
+    """
+    A shard input, output or receipt does not match its manifest.
+    """
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def count_tokens(chunks) -> int:
+    """
+    Count whitespace-separated tokens over a sequence of byte chunks,
+    counting a token split across two chunks once.
+    """
+    count = 0
+    in_token = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        count += len(chunk.split())
+        if in_token and not chunk[:1].isspace():
+            count -= 1
+        in_token = not chunk[-1:].isspace()
+    return count
+
+
+def iter_range(source, start: int, end: int):
+    """
+    Yield bytes [start, end) of a binary file in bounded chunks.
+    """
+    source.seek(start)
+    remaining = end - start
+    while remaining:
+        chunk = source.read(min(READ_CHUNK_SIZE, remaining))
+        if not chunk:
+            return
+        remaining -= len(chunk)
+        yield chunk
+
+
+def split(input_path: str, directory: str, shard_count: int) -> dict:
+    """
+    Split an input file into standalone shard inputs and write a manifest.
+
+    Each shard is a line-aligned byte range of the input's cases, written
+    to directory as its own input file (its case count, then the lines) so
+    any node can run the unmodified solver on it.
+
+    Args:
+        input_path: Input file (t on the first line, one case per line).
+        directory: Output directory for shard inputs and manifest.json.
+        shard_count: Desired number of shards.
+
+    Returns:
+        The manifest: source size and case count, plus per shard its file,
+        byte range, first case index, case count and sha256.
+
+    Raises:
+        ShardError: If the cases do not add up to t.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(input_path, "rb") as source:
+        header = source.readline().split()
+        case_count = int(header[0]) if header else 0
+
+        shards = []
+        first_case = 0
+        for index, (start, end) in enumerate(shard_boundaries(input_path, shard_count)):
+            token_count = count_tokens(iter_range(source, start, end))
+            if token_count % 4 != 0:
+                raise ShardError(f"bytes {start}-{end} hold {token_count} integers, not whole cases")
+
+            shard_cases = token_count // 4
+            name = f"shard_{index:05d}.in"
+            shard_path = os.path.join(directory, name)
+            with open(shard_path, "wb") as shard:
+                shard.write(f"{shard_cases}\n".encode())
+                for chunk in iter_range(source, start, end):
+                    shard.write(chunk)
+
+            shards.append({
+                "index": index,
+                "input": name,
+                "byte_start": start,
+                "byte_end": end,
+                "first_case": first_case,
+                "case_count": shard_cases,
+                "input_sha256": file_digest(shard_path),
+            })
+            first_case += shard_cases
+
+    if first_case != case_count:
+        raise ShardError(f"input declares {case_count} cases but holds {first_case}")
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "source": os.path.basename(input_path),
+        "source_size": os.path.getsize(input_path),
+        "case_count": case_count,
+        "shards": shards,
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return manifest
+
+
+def load_manifest(directory: str) -> dict:
+    with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ShardError(f"unsupported manifest version {manifest.get('version')!r}")
+    return manifest
+
+
+def output_name(shard: dict) -> str:
+    return shard["input"][:-len(".in")] + ".out"
+
+
+def receipt_name(shard: dict) -> str:
+    return output_name(shard) + ".json"
+
+
+def run_shard(directory: str, index: int, solver_args=()) -> dict:
+    """
+    Solve one shard of a manifest with standard.py and write its receipt.
+
+    The shard input is checked against the manifest checksum first. The
+    receipt records the input and output checksums and the answer count,
+    which merge verifies.
+
+    Args:
+        directory: Directory holding manifest.json and the shard inputs.
+        index: Shard index in the manifest.
+        solver_args: Extra command-line arguments for standard.py.
+
+    Returns:
+        The receipt.
+
+    Raises:
+        ShardError: If the input checksum or the answer count is wrong.
+    """
+    shard = load_manifest(directory)["shards"][index]
+    input_path = os.path.join(directory, shard["input"])
+    input_sha256 = file_digest(input_path)
+    if input_sha256 != shard["input_sha256"]:
+        raise ShardError(f"shard {index}: input checksum does not match the manifest")
+
+    output_path = os.path.join(directory, output_name(shard))
+    with open(output_path, "wb") as output:
+        subprocess.run(
+            [sys.executable, SOLVER_PATH, "--input", input_path, *solver_args],
+            stdout=output,
+            check=True,
+        )
+
+    with open(output_path, "rb") as output:
+        answer_count = count_tokens(iter(lambda: output.read(READ_CHUNK_SIZE), b""))
+    if answer_count != shard["case_count"]:
+        raise ShardError(f"shard {index}: {answer_count} answers for {shard['case_count']} cases")
+
+    receipt = {
+        "index": index,
+        "input_sha256": input_sha256,
+        "output_sha256": file_digest(output_path),
+        "answer_count": answer_count,
+    }
+    with open(os.path.join(directory, receipt_name(shard)), "w", encoding="utf-8") as f:
+        json.dump(receipt, f, indent=2)
+        f.write("\n")
+    return receipt
+
+
+def merge(directory: str, stream) -> int:
+    """
+    Concatenate shard outputs in case order after checking their receipts.
+
+    Every shard must have a receipt naming the manifest's input checksum,
+    its output file's checksum and the shard's case count. Answers are
+    written one per line without a trailing newline, as main() does.
+
+    Args:
+        directory: Directory holding manifest.json, shard outputs and receipts.
+        stream: Binary file-like object to write the merged answers to.
+
+    Returns:
+        The number of answers written.
+
+    Raises:
+        ShardError: If a shard is missing, stale or incomplete.
+    """
+    manifest = load_manifest(directory)
+    for shard in manifest["shards"]:
+        receipt_path = os.path.join(directory, receipt_name(shard))
+        if not os.path.exists(receipt_path):
+            raise ShardError(f"shard {shard['index']}: not run yet")
+        with open(receipt_path, encoding="utf-8") as f:
+            receipt = json.load(f)
+        if receipt["input_sha256"] != shard["input_sha256"]:
+            raise ShardError(f"shard {shard['index']}: output is from a different input")
+        if receipt["answer_count"] != shard["case_count"]:
+            raise ShardError(f"shard {shard['index']}: receipt counts {receipt['answer_count']} answers")
+        if file_digest(os.path.join(directory, output_name(shard))) != receipt["output_sha256"]:
+            raise ShardError(f"shard {shard['index']}: output checksum does not match its receipt")
+
+    separator = b""
+    written = 0
+    for shard in manifest["shards"]:
+        if not shard["case_count"]:
+            continue
+        stream.write(separator)
+        with open(os.path.join(directory, output_name(shard)), "rb") as output:
+            for chunk in iter(lambda: output.read(READ_CHUNK_SIZE), b""):
+                stream.write(chunk)
+        separator = b"\n"
+        written += shard["case_count"]
+    return written
+
+
+def run_local(input_path: str, shard_count: int, workers: int, stream, solver_args=()) -> int:
+    """
+    Split, run every shard on a local process pool and merge: the same
+    protocol a multi-node deployment follows, in a scratch directory.
+
+    Returns:
+        The number of answers written.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        manifest = split(input_path, directory, shard_count)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(run_shard, directory, shard["index"], solver_args)
+                for shard in manifest["shards"]
+            ]
+            for future in futures:
+                future.result()
+        return merge(directory, stream)
+
+
+def main(argv=None) -> None:
+    """
+    Split an input into shards, solve shards anywhere, merge the outputs.
+
+    Args:
+        argv: Command-line arguments; defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Map-reduce runner for standard.py over input shards.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    split_parser = commands.add_parser("split", help="write shard inputs and manifest.json")
+    split_parser.add_argument("--input", required=True, help="input file to split")
+    split_parser.add_argument("--dir", required=True, help="directory for shards and manifest")
+    split_parser.add_argument("--shards", type=int, required=True, help="number of shards")
+
+    run_parser = commands.add_parser("run", help="solve one shard and write its receipt")
+    run_parser.add_argument("--dir", required=True, help="directory holding manifest.json")
+    run_parser.add_argument("--shard", type=int, required=True, help="shard index")
+    run_parser.add_argument("solver_args", nargs=argparse.REMAINDER, help="arguments after -- go to standard.py")
+
+    merge_parser = commands.add_parser("merge", help="verify receipts and write merged answers")
+    merge_parser.add_argument("--dir", required=True, help="directory holding manifest.json")
+    merge_parser.add_argument("--output", help="write to this file instead of stdout")
+
+    local_parser = commands.add_parser("local", help="split, run on a process pool and merge")
+    local_parser.add_argument("--input", required=True, help="input file")
+    local_parser.add_argument("--shards", type=int, required=True, help="number of shards")
+    local_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    local_parser.add_argument("--output", help="write to this file instead of stdout")
+    local_parser.add_argument("solver_args", nargs=argparse.REMAINDER, help="arguments after -- go to standard.py")
+
+    args = parser.parse_args(argv)
+    solver_args = [arg for arg in getattr(args, "solver_args", []) if arg != "--"]
+    if getattr(args, "shards", 1) < 1:
+        parser.error("--shards must be at least 1")
+
+    try:
+        if args.command == "split":
+            manifest = split(args.input, args.dir, args.shards)
+            sys.stderr.write(f"{len(manifest['shards'])} shards, {manifest['case_count']} cases\n")
+        elif args.command == "run":
+            receipt = run_shard(args.dir, args.shard, solver_args)
+            sys.stderr.write(f"shard {args.shard}: {receipt['answer_count']} answers\n")
+        else:
+            stream = sys.stdout.buffer if args.output is None else open(args.output, "wb")
+            try:
+                if args.command == "merge":
+                    merge(args.dir, stream)
+                else:
+                    run_local(args.input, args.shards, args.workers, stream, solver_args)
+            finally:
+                if stream is not sys.stdout.buffer:
+                    stream.close()
+    except ShardError as e:
+        parser.exit(1, f"error: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
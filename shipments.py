@@ -0,0 +1,165 @@
+from standard import merge_congruences, solve_linear_congruence
+
+
+class ShipmentSet:
+    """
+    Every valid shipment of one test case, described lazily.
+
+    The feasible fleet counts k (B = d * k) form the arithmetic progression
+    k ≡ first_fleets (mod fleet_step) with 0 <= k <= maximum_fleets. Since
+    A + B = n / 2 - d * k, shipments are ordered by increasing total kites by
+    walking that progression from its largest term downwards.
+    """
+
+    __slots__ = (
+        "n_ribbons",
+        "fleet_size",
+        "first_fleets",
+        "fleet_step",
+        "maximum_fleets",
+        "count",
+    )
+
+    def __init__(
+        self,
+        n_ribbons: int,
+        fleet_size: int,
+        first_fleets: int,
+        fleet_step: int,
+        maximum_fleets: int,
+    ) -> None:
+        """
+        Args:
+            n_ribbons: Total number of ribbons n.
+            fleet_size: QuadTail batch size d.
+            first_fleets: Smallest feasible fleet count (merged residue).
+            fleet_step: Step between feasible fleet counts (merged modulus).
+            maximum_fleets: Largest fleet count that fits in n ribbons.
+        """
+        self.n_ribbons = n_ribbons
+        self.fleet_size = fleet_size
+        self.first_fleets = first_fleets
+        self.fleet_step = fleet_step
+        self.maximum_fleets = maximum_fleets
+        if first_fleets > maximum_fleets:
+            self.count = 0
+        else:
+            self.count = (maximum_fleets - first_fleets) // fleet_step + 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def __iter__(self):
+        """
+        Yield every (A, B) pair in order of increasing A + B.
+        """
+        half_ribbons = self.n_ribbons // 2
+        quad_kites = self.fleet_size * (
+            self.first_fleets + (self.count - 1) * self.fleet_step
+        )
+        quad_step = self.fleet_size * self.fleet_step
+        for _ in range(self.count):
+            yield half_ribbons - 2 * quad_kites, quad_kites
+            quad_kites -= quad_step
+
+    def shipment(self, index: int) -> tuple:
+        """
+        Return the index-th valid shipment in order of increasing A + B.
+
+        Args:
+            index: Position in the ordering; negative values count from the end.
+
+        Returns:
+            The (A, B) pair at that position.
+
+        Raises:
+            IndexError: If index is out of range.
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("shipment index out of range")
+
+        fleets = self.first_fleets + (self.count - 1 - index) * self.fleet_step
+        quad_kites = self.fleet_size * fleets
+        return self.n_ribbons // 2 - 2 * quad_kites, quad_kites
+
+    @property
+    def minimum_kites(self) -> int:
+        """
+        Smallest A + B over valid shipments, or -1 if there are none.
+        """
+        if self.count == 0:
+            return -1
+        return sum(self.shipment(0))
+
+    @property
+    def maximum_kites(self) -> int:
+        """
+        Largest A + B over valid shipments, or -1 if there are none.
+        """
+        if self.count == 0:
+            return -1
+        return sum(self.shipment(-1))
+
+
+def shipment_set(
+    n_ribbons: int,
+    carton_size: int,
+    fleet_size: int,
+    parade_modulus: int,
+) -> ShipmentSet:
+    """
+    Describe all valid shipments of one test case without enumerating them.
+
+    Args:
+        n_ribbons: Total number of ribbons n.
+        carton_size: TwinTail batch size c.
+        fleet_size: QuadTail batch size d.
+        parade_modulus: Divisibility requirement p for total kites.
+
+    Returns:
+        A ShipmentSet; it is empty when minimum_kites would return -1.
+    """
+    maximum_fleets = n_ribbons // (4 * fleet_size)
+    empty = ShipmentSet(
+        n_ribbons,
+        fleet_size,
+        maximum_fleets + 1,
+        1,
+        maximum_fleets,
+    )
+    if n_ribbons % 2 != 0:
+        return empty
+
+    first_solution = solve_linear_congruence(
+        4 * fleet_size,
+        n_ribbons,
+        2 * carton_size,
+    )
+    if first_solution is None:
+        return empty
+
+    second_solution = solve_linear_congruence(
+        fleet_size,
+        n_ribbons // 2,
+        parade_modulus,
+    )
+    if second_solution is None:
+        return empty
+
+    merged_solution = merge_congruences(*first_solution, *second_solution)
+    if merged_solution is None:
+        return empty
+
+    merged_residue, merged_modulus = merged_solution
+    return ShipmentSet(
+        n_ribbons,
+        fleet_size,
+        merged_residue,
+        merged_modulus,
+        maximum_fleets,
+    )
@@ -0,0 +1,94 @@
+import mmap
+import struct
+
+# Small-parameter table file: a header of an 8-byte magic and the bound,
+# then one (offset, period, merged_modulus) uint32 entry per (c, d, p) in
+# [1, bound]^3 in lexicographic order, then the int16 merged residues that
+# the entries' offsets point into. All fields are little-endian.
+HEADER = struct.Struct("<8sI")
+ENTRY = struct.Struct("<III")
+RESIDUE = struct.Struct("<h")
+MAGIC = b"KITETBL1"
+
+
+class SmallParameterTable:
+    """
+    Memory-mapped merged residues of every (c, d, p) up to a bound.
+
+    For a fixed triple, whether both congruences and their CRT merge are
+    solvable, and the merged residue B/d ≡ r (mod M), depend on n only
+    through n mod lcm(2c, 2p). The table stores that period, M, and r for
+    every even n below the period (-1 where there is no solution), so a
+    query costs two reads and the final rounding of minimum_kites. The file
+    is written by misc/small_table_builder.py.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Map a table file.
+
+        Args:
+            path: Path of the table file.
+
+        Raises:
+            ValueError: If the file is not a small-parameter table.
+        """
+        with open(path, "rb") as handle:
+            self._mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mapped) < HEADER.size:
+            raise ValueError(f"{path} is too short for a small-parameter table")
+        magic, self.bound = HEADER.unpack_from(self._mapped, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a small-parameter table")
+        self._residues_start = HEADER.size + ENTRY.size * self.bound**3
+
+    def covers(self, carton_size: int, fleet_size: int, parade_modulus: int) -> bool:
+        """
+        Whether the table holds the triple (c, d, p), i.e. all three are at
+        most its bound.
+        """
+        bound = self.bound
+        return carton_size <= bound and fleet_size <= bound and parade_modulus <= bound
+
+    def minimum_kites(
+        self,
+        n_ribbons: int,
+        carton_size: int,
+        fleet_size: int,
+        parade_modulus: int,
+    ) -> int:
+        """
+        Compute minimum_kites for a triple the table covers.
+
+        Args:
+            n_ribbons: Total number of ribbons n.
+            carton_size: TwinTail batch size c, at most the bound.
+            fleet_size: QuadTail batch size d, at most the bound.
+            parade_modulus: Divisibility requirement p, at most the bound.
+
+        Returns:
+            Minimum possible total number of kites, or -1 if impossible.
+        """
+        if n_ribbons % 2 != 0:
+            return -1
+        bound = self.bound
+        offset, period, merged_modulus = ENTRY.unpack_from(
+            self._mapped,
+            HEADER.size
+            + ENTRY.size
+            * (((carton_size - 1) * bound + fleet_size - 1) * bound + parade_modulus - 1),
+        )
+        merged_residue, = RESIDUE.unpack_from(
+            self._mapped,
+            self._residues_start + 2 * (offset + n_ribbons % period // 2),
+        )
+        if merged_residue < 0:
+            return -1
+
+        maximum_fleets = n_ribbons // (4 * fleet_size)
+        if merged_residue > maximum_fleets:
+            return -1
+
+        step_count = (maximum_fleets - merged_residue) // merged_modulus
+        best_fleets = merged_residue + step_count * merged_modulus
+        return n_ribbons // 2 - fleet_size * best_fleets
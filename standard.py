@@ -1,5 +1,37 @@
+import atexit
+import os
+import struct
 import sys
 import math
+import mmap
+import time
+from abc import ABC, abstractmethod
+from array import array
+from contextlib import ExitStack
+from functools import lru_cache
+from itertools import islice
+
+_CAN_RELEASE_PAGES = hasattr(mmap, "MADV_DONTNEED") and hasattr(mmap.mmap, "madvise")
+
+READ_CHUNK_SIZE = 1 << 16
+MMAP_WINDOW_SIZE = 1 << 16
+WRITE_BATCH_SIZE = 4096
+SHARDS_PER_WORKER = 4
+# Bytes of input per shard at most, so a worker's input and answers stay
+# small whatever the file size.
+SHARD_MAX_BYTES = 16 * READ_CHUNK_SIZE
+PLAN_CACHE_SIZE = 4096
+LEHMER_DIGIT_BITS = 32
+NT_BACKEND_ENV = "KITE_NT_BACKEND"
+DEFAULT_NT_BACKEND = "builtin"
+PROFILE_ENV = "KITE_PROFILE"
+# Binary record format: a header of an 8-byte magic and t as a little-endian
+# uint64, then t fixed-width little-endian int64 records. Case files hold
+# four int64 (n, c, d, p) per record, answer files one int64 per record.
+BINARY_HEADER = struct.Struct("<8sQ")
+BINARY_CASES_MAGIC = b"KITECAS1"
+BINARY_ANSWERS_MAGIC = b"KITEANS1"
+_SWAP_BYTES = sys.byteorder != "little"
 
 
 def extended_gcd(first: int, second: int) -> tuple:
@@ -37,6 +69,260 @@ def extended_gcd(first: int, second: int) -> tuple:
     return gcd_value, old_first_coef, old_second_coef
 
 
+def lehmer_extended_gcd(first: int, second: int) -> tuple:
+    """
+    Extended Euclidean algorithm with Lehmer's leading-digit acceleration.
+
+    While the operands are wider than LEHMER_DIGIT_BITS, several quotient
+    steps are simulated on their leading bits only and then applied to the
+    full operands and coefficients as one 2x2 matrix product.
+
+    Args:
+        first: First nonnegative integer.
+        second: Second nonnegative integer.
+
+    Returns:
+        A tuple (gcd_value, coefficient_first, coefficient_second) such that:
+        gcd_value = gcd(first, second)
+        coefficient_first * first + coefficient_second * second = gcd_value
+    """
+    swapped = first < second
+    if swapped:
+        first, second = second, first
+
+    old_remainder, remainder = first, second
+    old_first_coef, first_coef = 1, 0
+    old_second_coef, second_coef = 0, 1
+
+    while remainder >> LEHMER_DIGIT_BITS:
+        shift = old_remainder.bit_length() - LEHMER_DIGIT_BITS
+        leading_old = old_remainder >> shift
+        leading = remainder >> shift
+
+        top_left, top_right = 1, 0
+        bottom_left, bottom_right = 0, 1
+        while leading + bottom_left != 0 and leading + bottom_right != 0:
+            quotient = (leading_old + top_left) // (leading + bottom_left)
+            if quotient != (leading_old + top_right) // (leading + bottom_right):
+                break
+            top_left, bottom_left = bottom_left, top_left - quotient * bottom_left
+            top_right, bottom_right = (
+                bottom_right,
+                top_right - quotient * bottom_right,
+            )
+            leading_old, leading = leading, leading_old - quotient * leading
+
+        if top_right == 0:
+            quotient = old_remainder // remainder
+            old_remainder, remainder = remainder, old_remainder - quotient * remainder
+            old_first_coef, first_coef = (
+                first_coef,
+                old_first_coef - quotient * first_coef,
+            )
+            old_second_coef, second_coef = (
+                second_coef,
+                old_second_coef - quotient * second_coef,
+            )
+        else:
+            old_remainder, remainder = (
+                top_left * old_remainder + top_right * remainder,
+                bottom_left * old_remainder + bottom_right * remainder,
+            )
+            old_first_coef, first_coef = (
+                top_left * old_first_coef + top_right * first_coef,
+                bottom_left * old_first_coef + bottom_right * first_coef,
+            )
+            old_second_coef, second_coef = (
+                top_left * old_second_coef + top_right * second_coef,
+                bottom_left * old_second_coef + bottom_right * second_coef,
+            )
+
+    while remainder != 0:
+        quotient = old_remainder // remainder
+
+        old_remainder, remainder = remainder, old_remainder - quotient * remainder
+        old_first_coef, first_coef = first_coef, old_first_coef - quotient * first_coef
+        old_second_coef, second_coef = (
+            second_coef,
+            old_second_coef - quotient * second_coef,
+        )
+
+    if swapped:
+        return old_remainder, old_second_coef, old_first_coef
+    return old_remainder, old_first_coef, old_second_coef
+
+
+class NumberTheoryBackend(ABC):
+    """
+    The gcd, modular inverse and CRT merge primitives used by the solver.
+
+    Subclasses must provide inverse (and may replace gcd); merge is the
+    generalized CRT written in terms of those two.
+    """
+
+    name = ""
+    gcd = staticmethod(math.gcd)
+
+    @abstractmethod
+    def inverse(self, value: int, modulus: int) -> int:
+        """
+        Compute the modular inverse of value modulo modulus (assuming coprime).
+
+        Args:
+            value: Integer whose inverse is needed.
+            modulus: Modulus, must be positive.
+
+        Returns:
+            inverse such that (value * inverse) % modulus == 1
+
+        Raises:
+            ValueError: If inverse does not exist.
+        """
+
+    def merge(
+        self,
+        first_residue: int,
+        first_modulus: int,
+        second_residue: int,
+        second_modulus: int,
+    ):
+        """
+        Merge two congruences using generalized CRT:
+        unknown ≡ first_residue (mod first_modulus)
+        unknown ≡ second_residue (mod second_modulus)
+
+        Args:
+            first_residue: Residue of the first congruence.
+            first_modulus: Modulus of the first congruence (positive).
+            second_residue: Residue of the second congruence.
+            second_modulus: Modulus of the second congruence (positive).
+
+        Returns:
+            (merged_residue, merged_modulus) representing:
+            unknown ≡ merged_residue (mod merged_modulus),
+            or None if inconsistent.
+        """
+        if first_modulus == 1:
+            return second_residue % second_modulus, second_modulus
+        if second_modulus == 1:
+            return first_residue % first_modulus, first_modulus
+
+        gcd_value = self.gcd(first_modulus, second_modulus)
+        residue_difference = second_residue - first_residue
+        if residue_difference % gcd_value != 0:
+            return None
+
+        first_modulus_reduced = first_modulus // gcd_value
+        second_modulus_reduced = second_modulus // gcd_value
+
+        left_coefficient = first_modulus_reduced % second_modulus_reduced
+        right_constant = (residue_difference // gcd_value) % second_modulus_reduced
+
+        if second_modulus_reduced == 1:
+            multiplier = 0
+        else:
+            inverse = self.inverse(left_coefficient, second_modulus_reduced)
+            multiplier = (right_constant * inverse) % second_modulus_reduced
+
+        merged_modulus = first_modulus_reduced * second_modulus
+        merged_residue = (first_residue + first_modulus * multiplier) % merged_modulus
+        return merged_residue, merged_modulus
+
+
+class ReferenceBackend(NumberTheoryBackend):
+    """
+    Inverses from the interpreted extended_gcd loop.
+    """
+
+    name = "reference"
+
+    def inverse(self, value: int, modulus: int) -> int:
+        gcd_value, value_coef, _ = extended_gcd(value, modulus)
+        if gcd_value != 1:
+            raise ValueError("Modular inverse does not exist.")
+        return value_coef % modulus
+
+
+class BuiltinBackend(NumberTheoryBackend):
+    """
+    Inverses from the builtin pow(value, -1, modulus).
+    """
+
+    name = "builtin"
+
+    def inverse(self, value: int, modulus: int) -> int:
+        try:
+            return pow(value, -1, modulus)
+        except ValueError:
+            raise ValueError("Modular inverse does not exist.") from None
+
+
+class LehmerBackend(NumberTheoryBackend):
+    """
+    Inverses from lehmer_extended_gcd.
+    """
+
+    name = "lehmer"
+
+    def inverse(self, value: int, modulus: int) -> int:
+        gcd_value, value_coef, _ = lehmer_extended_gcd(value % modulus, modulus)
+        if gcd_value != 1:
+            raise ValueError("Modular inverse does not exist.")
+        return value_coef % modulus
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (ReferenceBackend(), BuiltinBackend(), LehmerBackend())
+}
+
+
+def _backend_from_environment() -> NumberTheoryBackend:
+    """
+    Raises:
+        ValueError: If KITE_NT_BACKEND names no backend.
+    """
+    name = os.environ.get(NT_BACKEND_ENV, DEFAULT_NT_BACKEND)
+    if name not in BACKENDS:
+        raise ValueError(
+            f"{NT_BACKEND_ENV}={name!r} is not a number-theory backend;"
+            f" expected one of {', '.join(sorted(BACKENDS))}"
+        )
+    return BACKENDS[name]
+
+
+_backend = _backend_from_environment()
+
+
+def set_backend(name: str) -> NumberTheoryBackend:
+    """
+    Select the number-theory backend used by the solver.
+
+    Args:
+        name: One of the keys of BACKENDS.
+
+    Returns:
+        The selected backend.
+
+    Raises:
+        ValueError: If no backend has that name.
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown number-theory backend: {name!r}")
+    _backend = BACKENDS[name]
+    if _profile is not None:
+        _backend = _ProfiledBackend(_backend)
+    return _backend
+
+
+def get_backend() -> NumberTheoryBackend:
+    """
+    Return the number-theory backend currently used by the solver.
+    """
+    return _backend
+
+
 def modular_inverse(value: int, modulus: int) -> int:
     """
     Compute the modular inverse of value modulo modulus (assuming coprime).
@@ -51,10 +337,55 @@ def modular_inverse(value: int, modulus: int) -> int:
     Raises:
         ValueError: If inverse does not exist.
     """
-    gcd_value, value_coef, _ = extended_gcd(value, modulus)
-    if gcd_value != 1:
-        raise ValueError("Modular inverse does not exist.")
-    return value_coef % modulus
+    return _backend.inverse(value, modulus)
+
+
+def shared_modulus_inverses(values: list, modulus: int) -> list:
+    """
+    Invert many values modulo one modulus with Montgomery's trick.
+
+    The running products of all values are inverted with a single
+    modular_inverse call and unwound with three multiplications per value.
+    If the product is not invertible, the offending values are found with
+    gcd and the trick is rerun on the rest.
+
+    Args:
+        values: Integers to invert.
+        modulus: Shared modulus, must be positive.
+
+    Returns:
+        List aligned with values holding each inverse, or None for values
+        that are not coprime to modulus.
+    """
+    if modulus == 1:
+        return [0] * len(values)
+
+    inverses: list = [None] * len(values)
+    positions = range(len(values))
+    while positions:
+        prefix_products = []
+        running_product = 1
+        for position in positions:
+            running_product = running_product * values[position] % modulus
+            prefix_products.append(running_product)
+
+        if _backend.gcd(running_product, modulus) != 1:
+            positions = [
+                position
+                for position in positions
+                if _backend.gcd(values[position], modulus) == 1
+            ]
+            continue
+
+        running_inverse = modular_inverse(running_product, modulus)
+        for index in range(len(positions) - 1, 0, -1):
+            position = positions[index]
+            inverses[position] = running_inverse * prefix_products[index - 1] % modulus
+            running_inverse = running_inverse * values[position] % modulus
+        inverses[positions[0]] = running_inverse
+        break
+
+    return inverses
 
 
 def solve_linear_congruence(coefficient: int, right_side: int, modulus: int):
@@ -77,7 +408,7 @@ def solve_linear_congruence(coefficient: int, right_side: int, modulus: int):
     coefficient %= modulus
     right_side %= modulus
 
-    gcd_value = math.gcd(coefficient, modulus)
+    gcd_value = _backend.gcd(coefficient, modulus)
     if right_side % gcd_value != 0:
         return None
 
@@ -117,31 +448,12 @@ def merge_congruences(
         unknown ≡ merged_residue (mod merged_modulus),
         or None if inconsistent.
     """
-    if first_modulus == 1:
-        return second_residue % second_modulus, second_modulus
-    if second_modulus == 1:
-        return first_residue % first_modulus, first_modulus
-
-    gcd_value = math.gcd(first_modulus, second_modulus)
-    residue_difference = second_residue - first_residue
-    if residue_difference % gcd_value != 0:
-        return None
-
-    first_modulus_reduced = first_modulus // gcd_value
-    second_modulus_reduced = second_modulus // gcd_value
-
-    left_coefficient = first_modulus_reduced % second_modulus_reduced
-    right_constant = (residue_difference // gcd_value) % second_modulus_reduced
-
-    if second_modulus_reduced == 1:
-        multiplier = 0
-    else:
-        inverse = modular_inverse(left_coefficient, second_modulus_reduced)
-        multiplier = (right_constant * inverse) % second_modulus_reduced
-
-    merged_modulus = first_modulus_reduced * second_modulus
-    merged_residue = (first_residue + first_modulus * multiplier) % merged_modulus
-    return merged_residue, merged_modulus
+    return _backend.merge(
+        first_residue,
+        first_modulus,
+        second_residue,
+        second_modulus,
+    )
 
 
 def minimum_kites(
@@ -149,6 +461,7 @@ def minimum_kites(
     carton_size: int,
     fleet_size: int,
     parade_modulus: int,
+    trace=None,
 ) -> int:
     """
     Compute the minimum number of kites satisfying all constraints.
@@ -158,78 +471,1415 @@ def minimum_kites(
         carton_size: TwinTail batch size c.
         fleet_size: QuadTail batch size d.
         parade_modulus: Divisibility requirement p for total kites.
+        trace: Optional function called with the name of every closed form
+            taken ("fast_path.*") and of the branch returned from ("exit.*").
 
     Returns:
         Minimum possible total number of kites, or -1 if impossible.
     """
     if n_ribbons % 2 != 0:
+        if trace is not None:
+            trace("exit.odd_n")
         return -1
 
-    maximum_fleets = n_ribbons // (4 * fleet_size)
-
-    first_solution = solve_linear_congruence(
-        4 * fleet_size,
-        n_ribbons,
-        2 * carton_size,
-    )
-    if first_solution is None:
+    # Pre-filters, cheapest first, before any congruence is solved.
+    half_ribbons = n_ribbons // 2
+    if 0 < half_ribbons < parade_modulus:
+        # A + B lies in [n/4, n/2] and cannot be a positive multiple of p.
+        if trace is not None:
+            trace("exit.p_above_half")
         return -1
-    first_residue, first_modulus = first_solution
 
-    second_solution = solve_linear_congruence(
-        fleet_size,
-        n_ribbons // 2,
-        parade_modulus,
-    )
-    if second_solution is None:
+    maximum_fleets = n_ribbons // (4 * fleet_size)
+    if maximum_fleets == 0:
+        # Only B = 0 fits: A = n/2 must be a multiple of both c and p.
+        if half_ribbons % carton_size == 0 and half_ribbons % parade_modulus == 0:
+            if trace is not None:
+                trace("exit.no_fleet_room_solved")
+            return half_ribbons
+        if trace is not None:
+            trace("exit.no_fleet_room_infeasible")
         return -1
-    second_residue, second_modulus = second_solution
 
-    merged_solution = merge_congruences(
-        first_residue,
-        first_modulus,
-        second_residue,
-        second_modulus,
-    )
-    if merged_solution is None:
-        return -1
+    # Closed forms: c == 1 leaves 4d * B ≡ n (mod 2) true for every B, p == 1
+    # drops the second congruence, and d == 1 needs no inverse in it.
+    if carton_size == 1:
+        if trace is not None:
+            trace("fast_path.c_one")
+        first_residue, first_modulus = 0, 1
+    else:
+        first_solution = solve_linear_congruence(
+            4 * fleet_size,
+            n_ribbons,
+            2 * carton_size,
+        )
+        if first_solution is None:
+            if trace is not None:
+                trace("exit.first_congruence_infeasible")
+            return -1
+        first_residue, first_modulus = first_solution
+
+    if parade_modulus == 1:
+        if trace is not None:
+            trace("fast_path.p_one")
+        second_residue, second_modulus = 0, 1
+    elif fleet_size == 1:
+        if trace is not None:
+            trace("fast_path.d_one")
+        second_residue, second_modulus = half_ribbons % parade_modulus, parade_modulus
+    else:
+        second_solution = solve_linear_congruence(
+            fleet_size,
+            half_ribbons,
+            parade_modulus,
+        )
+        if second_solution is None:
+            if trace is not None:
+                trace("exit.second_congruence_infeasible")
+            return -1
+        second_residue, second_modulus = second_solution
+
+    if first_modulus == 1:
+        merged_residue, merged_modulus = second_residue, second_modulus
+    elif second_modulus == 1:
+        merged_residue, merged_modulus = first_residue, first_modulus
+    else:
+        merged_solution = merge_congruences(
+            first_residue,
+            first_modulus,
+            second_residue,
+            second_modulus,
+        )
+        if merged_solution is None:
+            if trace is not None:
+                trace("exit.crt_inconsistent")
+            return -1
+        merged_residue, merged_modulus = merged_solution
 
-    merged_residue, merged_modulus = merged_solution
     if merged_residue > maximum_fleets:
+        if trace is not None:
+            trace("exit.residue_above_maximum_fleets")
         return -1
 
     step_count = (maximum_fleets - merged_residue) // merged_modulus
     best_fleets = merged_residue + step_count * merged_modulus
 
-    total_kites = n_ribbons // 2 - fleet_size * best_fleets
+    total_kites = half_ribbons - fleet_size * best_fleets
+    if trace is not None:
+        trace("exit.solved")
     return total_kites
 
 
-def main() -> None:
+class SolverPlan:
     """
-    Read input, solve all test cases, and print outputs.
+    The n-independent part of minimum_kites, precomputed for one (c, d, p).
+
+    Both linear congruences and the CRT merge only need gcds, reduced moduli
+    and modular inverses of c, d and p; the plan stores those so solving for
+    a new n costs a few multiplications and reductions.
     """
-    data = sys.stdin.buffer.read().split()
-    test_cases = int(data[0])
 
-    outputs: list = []
-    token_index = 1
-    for _ in range(test_cases):
-        n_ribbons = int(data[token_index])
-        carton_size = int(data[token_index + 1])
-        fleet_size = int(data[token_index + 2])
-        parade_modulus = int(data[token_index + 3])
-        token_index += 4
+    __slots__ = (
+        "carton_size",
+        "fleet_size",
+        "parade_modulus",
+        "first_full_modulus",
+        "first_gcd",
+        "first_modulus",
+        "first_inverse",
+        "second_gcd",
+        "second_modulus",
+        "second_inverse",
+        "merge_gcd",
+        "second_modulus_reduced",
+        "merge_inverse",
+        "merged_modulus",
+    )
+
+    def __init__(
+        self,
+        carton_size: int,
+        fleet_size: int,
+        parade_modulus: int,
+    ) -> None:
+        """
+        Precompute the congruence data for one parameter triple.
+
+        Args:
+            carton_size: TwinTail batch size c.
+            fleet_size: QuadTail batch size d.
+            parade_modulus: Divisibility requirement p for total kites.
+        """
+        self.carton_size = carton_size
+        self.fleet_size = fleet_size
+        self.parade_modulus = parade_modulus
+
+        # 4d * B ≡ n (mod 2c)
+        self.first_full_modulus = 2 * carton_size
+        first_coefficient = (4 * fleet_size) % self.first_full_modulus
+        self.first_gcd = math.gcd(first_coefficient, self.first_full_modulus)
+        self.first_modulus = self.first_full_modulus // self.first_gcd
+        self.first_inverse = modular_inverse(
+            (first_coefficient // self.first_gcd) % self.first_modulus,
+            self.first_modulus,
+        )
+
+        # d * B ≡ n / 2 (mod p)
+        second_coefficient = fleet_size % parade_modulus
+        self.second_gcd = math.gcd(second_coefficient, parade_modulus)
+        self.second_modulus = parade_modulus // self.second_gcd
+        self.second_inverse = modular_inverse(
+            (second_coefficient // self.second_gcd) % self.second_modulus,
+            self.second_modulus,
+        )
+
+        # CRT merge of the two reduced moduli.
+        self.merge_gcd = math.gcd(self.first_modulus, self.second_modulus)
+        first_modulus_reduced = self.first_modulus // self.merge_gcd
+        self.second_modulus_reduced = self.second_modulus // self.merge_gcd
+        self.merge_inverse = modular_inverse(
+            first_modulus_reduced % self.second_modulus_reduced,
+            self.second_modulus_reduced,
+        )
+        self.merged_modulus = first_modulus_reduced * self.second_modulus
+
+    def minimum_kites(self, n_ribbons: int) -> int:
+        """
+        Compute minimum_kites(n_ribbons, c, d, p) for this plan's triple.
+
+        Args:
+            n_ribbons: Total number of ribbons n.
 
-        answer = minimum_kites(
+        Returns:
+            Minimum possible total number of kites, or -1 if impossible.
+        """
+        if n_ribbons % 2 != 0:
+            return -1
+        return self.minimum_kites_from_remainders(
             n_ribbons,
-            carton_size,
-            fleet_size,
-            parade_modulus,
+            n_ribbons % self.first_full_modulus,
+            n_ribbons // 2 % self.parade_modulus,
+        )
+
+    def minimum_kites_from_remainders(
+        self,
+        n_ribbons: int,
+        carton_remainder: int,
+        half_remainder: int,
+    ) -> int:
+        """
+        Compute minimum_kites for this plan's triple from n's remainders.
+
+        Callers that keep n mod 2c and (n / 2) mod p up to date, such as
+        KiteLedger, skip reducing n itself.
+
+        Args:
+            n_ribbons: Total number of ribbons n.
+            carton_remainder: n mod 2c; its parity is that of n.
+            half_remainder: (n / 2) mod p, only read when n is even.
+
+        Returns:
+            Minimum possible total number of kites, or -1 if impossible.
+        """
+        # 2c is even, so the remainder carries the parity of n.
+        if carton_remainder % 2 != 0:
+            return -1
+        if carton_remainder % self.first_gcd != 0:
+            return -1
+        if half_remainder % self.second_gcd != 0:
+            return -1
+
+        first_residue = (
+            carton_remainder // self.first_gcd
+            * self.first_inverse
+            % self.first_modulus
+        )
+        second_residue = (
+            half_remainder // self.second_gcd
+            * self.second_inverse
+            % self.second_modulus
         )
-        outputs.append(str(answer))
 
-    sys.stdout.write("\n".join(outputs))
+        residue_difference = second_residue - first_residue
+        if residue_difference % self.merge_gcd != 0:
+            return -1
+        multiplier = (
+            residue_difference // self.merge_gcd
+            * self.merge_inverse
+            % self.second_modulus_reduced
+        )
+        merged_residue = first_residue + self.first_modulus * multiplier
+
+        maximum_fleets = n_ribbons // (4 * self.fleet_size)
+        if merged_residue > maximum_fleets:
+            return -1
+
+        step_count = (maximum_fleets - merged_residue) // self.merged_modulus
+        best_fleets = merged_residue + step_count * self.merged_modulus
+        return n_ribbons // 2 - self.fleet_size * best_fleets
+
+
+def _build_plan(
+    carton_size: int,
+    fleet_size: int,
+    parade_modulus: int,
+) -> SolverPlan:
+    return SolverPlan(carton_size, fleet_size, parade_modulus)
+
+
+compile_plan = lru_cache(maxsize=PLAN_CACHE_SIZE)(_build_plan)
+
+
+def set_plan_cache_size(size: int) -> None:
+    """
+    Replace the plan cache with an empty LRU cache holding at most size plans.
+
+    Args:
+        size: Maximum number of cached plans (must be positive).
+    """
+    global compile_plan
+    compile_plan = lru_cache(maxsize=size)(_build_plan)
+
+
+def plan_cache_stats() -> dict:
+    """
+    Report the plan cache counters.
+
+    Returns:
+        Dict with hits, misses, current size and capacity of the cache.
+    """
+    info = compile_plan.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "capacity": info.maxsize,
+    }
+
+
+def minimum_kites_planned(
+    n_ribbons: int,
+    carton_size: int,
+    fleet_size: int,
+    parade_modulus: int,
+) -> int:
+    """
+    Same as minimum_kites, but reuses a cached plan for (c, d, p).
+
+    Args:
+        n_ribbons: Total number of ribbons n.
+        carton_size: TwinTail batch size c.
+        fleet_size: QuadTail batch size d.
+        parade_modulus: Divisibility requirement p for total kites.
+
+    Returns:
+        Minimum possible total number of kites, or -1 if impossible.
+    """
+    return compile_plan(carton_size, fleet_size, parade_modulus).minimum_kites(
+        n_ribbons
+    )
+
+
+_small_table = None
+
+
+def load_small_table(path: str):
+    """
+    Map a small-parameter table and use it in minimum_kites_tabled.
+
+    Args:
+        path: Path of the table file.
+
+    Returns:
+        The loaded small_table.SmallParameterTable.
+    """
+    from small_table import SmallParameterTable
+
+    global _small_table
+    _small_table = SmallParameterTable(path)
+    return _small_table
+
+
+def minimum_kites_tabled(
+    n_ribbons: int,
+    carton_size: int,
+    fleet_size: int,
+    parade_modulus: int,
+) -> int:
+    """
+    Same as minimum_kites, but answers triples covered by the loaded
+    small-parameter table from the table.
+
+    Args:
+        n_ribbons: Total number of ribbons n.
+        carton_size: TwinTail batch size c.
+        fleet_size: QuadTail batch size d.
+        parade_modulus: Divisibility requirement p for total kites.
+
+    Returns:
+        Minimum possible total number of kites, or -1 if impossible.
+    """
+    table = _small_table
+    if table is not None and table.covers(carton_size, fleet_size, parade_modulus):
+        return table.minimum_kites(n_ribbons, carton_size, fleet_size, parade_modulus)
+    return minimum_kites(n_ribbons, carton_size, fleet_size, parade_modulus)
+
+
+def certify_minimum_kites(
+    n_ribbons: int,
+    carton_size: int,
+    fleet_size: int,
+    parade_modulus: int,
+) -> tuple:
+    """
+    Solve one test case and return a certificate that proves the answer.
+
+    Certificates are tuples whose first item names their kind:
+    ("odd_n",), ("first_gcd", g) with g = gcd(4d, 2c) not dividing n,
+    ("second_gcd", g) with g = gcd(d, p) not dividing n / 2,
+    ("crt", r1, m1, r2, m2) for inconsistent congruence solutions,
+    ("above", r, m) when the smallest feasible fleet count r exceeds
+    n // (4d), and ("witness", A, B, m) for a feasible answer, where m is the
+    step between feasible fleet counts, so the next larger one does not fit.
+
+    Args:
+        n_ribbons: Total number of ribbons n.
+        carton_size: TwinTail batch size c.
+        fleet_size: QuadTail batch size d.
+        parade_modulus: Divisibility requirement p for total kites.
+
+    Returns:
+        (answer, certificate), where answer matches minimum_kites.
+    """
+    if n_ribbons % 2 != 0:
+        return -1, ("odd_n",)
+
+    maximum_fleets = n_ribbons // (4 * fleet_size)
+
+    first_solution = solve_linear_congruence(
+        4 * fleet_size,
+        n_ribbons,
+        2 * carton_size,
+    )
+    if first_solution is None:
+        return -1, ("first_gcd", math.gcd(4 * fleet_size, 2 * carton_size))
+    first_residue, first_modulus = first_solution
+
+    second_solution = solve_linear_congruence(
+        fleet_size,
+        n_ribbons // 2,
+        parade_modulus,
+    )
+    if second_solution is None:
+        return -1, ("second_gcd", math.gcd(fleet_size, parade_modulus))
+    second_residue, second_modulus = second_solution
+
+    merged_solution = merge_congruences(
+        first_residue,
+        first_modulus,
+        second_residue,
+        second_modulus,
+    )
+    if merged_solution is None:
+        return -1, (
+            "crt",
+            first_residue,
+            first_modulus,
+            second_residue,
+            second_modulus,
+        )
+
+    merged_residue, merged_modulus = merged_solution
+    if merged_residue > maximum_fleets:
+        return -1, ("above", merged_residue, merged_modulus)
+
+    step_count = (maximum_fleets - merged_residue) // merged_modulus
+    best_fleets = merged_residue + step_count * merged_modulus
+
+    quad_kites = fleet_size * best_fleets
+    twin_kites = n_ribbons // 2 - 2 * quad_kites
+    return twin_kites + quad_kites, (
+        "witness",
+        twin_kites,
+        quad_kites,
+        merged_modulus,
+    )
+
+
+def format_certificate(certificate: tuple) -> str:
+    """
+    Render a certificate as one space-separated line (without newline).
+    """
+    return " ".join(map(str, certificate))
+
+
+def minimum_kites_many(cases) -> list:
+    """
+    Solve a batch of test cases, sharing modular inversions between queries.
+
+    Each stage of minimum_kites (both linear congruences and the CRT merge)
+    groups the batch by reduced modulus and inverts every coefficient of a
+    group at once with shared_modulus_inverses. This pays off when many
+    queries share p or c.
+
+    Args:
+        cases: Iterable of (n_ribbons, carton_size, fleet_size, parade_modulus).
+
+    Returns:
+        List of answers aligned with cases.
+    """
+    cases = list(cases)
+    answers = [-1] * len(cases)
+    gcd = _backend.gcd
+
+    # 4d * B ≡ n (mod 2c), grouped by 2c / gcd.
+    first_groups: dict = {}
+    for index, (n_ribbons, carton_size, fleet_size, _) in enumerate(cases):
+        if n_ribbons % 2 != 0:
+            continue
+        full_modulus = 2 * carton_size
+        coefficient = (4 * fleet_size) % full_modulus
+        gcd_value = gcd(coefficient, full_modulus)
+        if n_ribbons % gcd_value != 0:
+            continue
+        reduced_modulus = full_modulus // gcd_value
+        right_side = (n_ribbons % full_modulus) // gcd_value % reduced_modulus
+        first_groups.setdefault(reduced_modulus, []).append(
+            (index, coefficient // gcd_value % reduced_modulus, right_side)
+        )
+
+    first_solutions: dict = {}
+    for reduced_modulus, group in first_groups.items():
+        inverses = shared_modulus_inverses(
+            [coefficient for _, coefficient, _ in group],
+            reduced_modulus,
+        )
+        for (index, _, right_side), inverse in zip(group, inverses):
+            first_solutions[index] = (
+                right_side * inverse % reduced_modulus,
+                reduced_modulus,
+            )
+
+    # d * B ≡ n / 2 (mod p), grouped by p / gcd.
+    second_groups: dict = {}
+    for index in first_solutions:
+        n_ribbons, _, fleet_size, parade_modulus = cases[index]
+        half_ribbons = n_ribbons // 2
+        coefficient = fleet_size % parade_modulus
+        gcd_value = gcd(coefficient, parade_modulus)
+        if half_ribbons % gcd_value != 0:
+            continue
+        reduced_modulus = parade_modulus // gcd_value
+        right_side = (half_ribbons % parade_modulus) // gcd_value % reduced_modulus
+        second_groups.setdefault(reduced_modulus, []).append(
+            (index, coefficient // gcd_value % reduced_modulus, right_side)
+        )
+
+    # Generalized CRT, grouped by the reduced second modulus.
+    merge_groups: dict = {}
+    for reduced_modulus, group in second_groups.items():
+        inverses = shared_modulus_inverses(
+            [coefficient for _, coefficient, _ in group],
+            reduced_modulus,
+        )
+        for (index, _, right_side), inverse in zip(group, inverses):
+            second_residue = right_side * inverse % reduced_modulus
+            first_residue, first_modulus = first_solutions[index]
+
+            gcd_value = gcd(first_modulus, reduced_modulus)
+            residue_difference = second_residue - first_residue
+            if residue_difference % gcd_value != 0:
+                continue
+            second_modulus_reduced = reduced_modulus // gcd_value
+            merge_groups.setdefault(second_modulus_reduced, []).append((
+                index,
+                first_modulus // gcd_value % second_modulus_reduced,
+                residue_difference // gcd_value % second_modulus_reduced,
+                first_residue,
+                first_modulus,
+            ))
+
+    for second_modulus_reduced, group in merge_groups.items():
+        inverses = shared_modulus_inverses(
+            [left_coefficient for _, left_coefficient, _, _, _ in group],
+            second_modulus_reduced,
+        )
+        for (index, _, right_constant, first_residue, first_modulus), inverse in zip(
+            group, inverses
+        ):
+            n_ribbons, _, fleet_size, _ = cases[index]
+            multiplier = right_constant * inverse % second_modulus_reduced
+            merged_modulus = first_modulus * second_modulus_reduced
+            merged_residue = first_residue + first_modulus * multiplier
+
+            maximum_fleets = n_ribbons // (4 * fleet_size)
+            if merged_residue > maximum_fleets:
+                continue
+            step_count = (maximum_fleets - merged_residue) // merged_modulus
+            best_fleets = merged_residue + step_count * merged_modulus
+            answers[index] = n_ribbons // 2 - fleet_size * best_fleets
+
+    return answers
+
+
+def iter_tokens(stream, chunk_size: int = READ_CHUNK_SIZE):
+    """
+    Yield integer tokens from a binary stream read in fixed-size chunks.
+
+    A number split across a chunk boundary is carried over and completed
+    with the next chunk, so only one chunk is held in memory at a time.
+
+    Args:
+        stream: Binary file-like object to read from.
+        chunk_size: Number of bytes requested per read.
+
+    Yields:
+        Each whitespace-separated integer in the stream, in order.
+    """
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        chunk = pending + chunk
+        tokens = chunk.split()
+        if tokens and not chunk[-1:].isspace():
+            pending = tokens.pop()
+        else:
+            pending = b""
+        for token in tokens:
+            yield int(token)
+
+    if pending:
+        yield int(pending)
+
+
+def cases_from_tokens(tokens):
+    """
+    Group an integer token stream (t first) into test cases.
+
+    Args:
+        tokens: Iterator of integers.
+
+    Yields:
+        (n_ribbons, carton_size, fleet_size, parade_modulus) tuples.
+    """
+    test_cases = next(tokens, 0)
+    yield from islice(zip(tokens, tokens, tokens, tokens), test_cases)
+
+
+def iter_test_cases(stream, chunk_size: int = READ_CHUNK_SIZE):
+    """
+    Yield test cases from a binary input stream without buffering it whole.
+
+    Args:
+        stream: Binary file-like object holding t followed by the cases.
+        chunk_size: Number of bytes requested per read.
+
+    Yields:
+        (n_ribbons, carton_size, fleet_size, parade_modulus) tuples.
+    """
+    return cases_from_tokens(iter_tokens(stream, chunk_size))
+
+
+def iter_mapped_windows(path: str, window_size: int = MMAP_WINDOW_SIZE):
+    """
+    Walk a memory-mapped file in windows that never cut a number.
+
+    Each window ends on a whitespace byte (or at EOF). Once the consumer
+    asks for the next window, the pages already scanned are dropped with
+    MADV_DONTNEED where available, so resident memory stays flat on
+    multi-gigabyte files. Consumers must not keep views of a window past
+    that point.
+
+    Args:
+        path: Path of the file to map.
+        window_size: Approximate number of bytes per window.
+
+    Yields:
+        (mapped, start, end) with mapped the mmap object and [start, end)
+        the byte range of the window.
+    """
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = 0
+            released = 0
+            while start < size:
+                end = min(size, start + window_size)
+                while end < size and not mapped[end:end + 1].isspace():
+                    end += 1
+
+                yield mapped, start, end
+
+                release_end = end - end % mmap.PAGESIZE
+                if _CAN_RELEASE_PAGES and release_end > released:
+                    mapped.madvise(
+                        mmap.MADV_DONTNEED,
+                        released,
+                        release_end - released,
+                    )
+                    released = release_end
+                start = end
+
+
+def iter_mapped_integers(path: str, window_size: int = MMAP_WINDOW_SIZE):
+    """
+    Yield every integer of a file, reading it through iter_mapped_windows.
+
+    Only one window of the file is ever copied out of the mapping, so no
+    whole-file buffer or token list is built.
+
+    Args:
+        path: Path of the file to scan.
+        window_size: Approximate number of bytes parsed per window.
+
+    Yields:
+        Each whitespace-separated integer, in file order.
+
+    Raises:
+        ValueError: If the file holds a token that is not an integer.
+    """
+    for mapped, start, end in iter_mapped_windows(path, window_size):
+        yield from map(int, mapped[start:end].split())
+
+
+def iter_mapped_test_cases(path: str):
+    """
+    Yield the test cases of an input file through iter_mapped_integers.
+
+    Args:
+        path: Path of the input file.
+
+    Yields:
+        (n_ribbons, carton_size, fleet_size, parade_modulus) tuples.
+    """
+    return cases_from_tokens(iter_mapped_integers(path))
+
+
+def read_binary_header(stream, magic: bytes) -> int:
+    """
+    Read and check the header of a binary case or answer file.
+
+    Args:
+        stream: Binary file-like object positioned at the header.
+        magic: Expected magic, BINARY_CASES_MAGIC or BINARY_ANSWERS_MAGIC.
+
+    Returns:
+        The record count t.
+
+    Raises:
+        ValueError: If the header is short or carries another magic.
+    """
+    header = stream.read(BINARY_HEADER.size)
+    if len(header) != BINARY_HEADER.size:
+        raise ValueError("truncated binary header")
+    found, record_count = BINARY_HEADER.unpack(header)
+    if found != magic:
+        raise ValueError(f"bad binary magic {found!r}, expected {magic!r}")
+    return record_count
+
+
+def read_binary_integers(stream, count: int, batch_size: int = WRITE_BATCH_SIZE):
+    """
+    Read count little-endian int64 values, a bounded batch at a time.
+
+    Each batch is read with readinto into one reused buffer and decoded
+    with array.frombytes, without per-value parsing.
+
+    Args:
+        stream: Binary file-like object positioned at the first record.
+        count: Number of int64 values to read.
+        batch_size: Number of values decoded per batch.
+
+    Yields:
+        array('q') batches holding count values in total.
+
+    Raises:
+        ValueError: If the stream ends early.
+    """
+    buffer = bytearray(8 * min(count, batch_size))
+    view = memoryview(buffer)
+    remaining = count
+    while remaining:
+        wanted = 8 * min(remaining, batch_size)
+        filled = 0
+        while filled < wanted:
+            got = stream.readinto(view[filled:wanted])
+            if not got:
+                raise ValueError(
+                    f"binary records end after {count - remaining + filled // 8}"
+                    f" of {count} values"
+                )
+            filled += got
+        values = array("q")
+        values.frombytes(view[:wanted])
+        if _SWAP_BYTES:
+            values.byteswap()
+        yield values
+        remaining -= wanted // 8
+
+
+def iter_binary_test_cases(stream, case_count: int):
+    """
+    Yield the test cases of a binary case file whose header has been read.
+
+    Args:
+        stream: Binary file-like object positioned after the header.
+        case_count: Number of records, from read_binary_header.
+
+    Yields:
+        (n_ribbons, carton_size, fleet_size, parade_modulus) tuples.
+    """
+    for values in read_binary_integers(stream, 4 * case_count):
+        fields = iter(values)
+        yield from zip(fields, fields, fields, fields)
+
+
+def solve_cases(cases, solver=minimum_kites):
+    """
+    Lazily solve test cases one by one.
+
+    Args:
+        cases: Iterable of (n_ribbons, carton_size, fleet_size, parade_modulus).
+        solver: Function (n, c, d, p) -> answer used for each case.
+
+    Yields:
+        The answer of each test case, in input order.
+    """
+    for n_ribbons, carton_size, fleet_size, parade_modulus in cases:
+        yield solver(n_ribbons, carton_size, fleet_size, parade_modulus)
+
+
+def solve_cases_certified(cases, certificate_stream):
+    """
+    Lazily solve test cases, writing one certificate line per case.
+
+    Args:
+        cases: Iterable of (n_ribbons, carton_size, fleet_size, parade_modulus).
+        certificate_stream: Text file-like object receiving certificate lines.
+
+    Yields:
+        The answer of each test case, in input order.
+    """
+    for n_ribbons, carton_size, fleet_size, parade_modulus in cases:
+        answer, certificate = certify_minimum_kites(
+            n_ribbons,
+            carton_size,
+            fleet_size,
+            parade_modulus,
+        )
+        certificate_stream.write(format_certificate(certificate) + "\n")
+        yield answer
+
+
+def solve_cases_batched(cases, batch_size: int):
+    """
+    Solve test cases batch by batch with minimum_kites_many.
+
+    Args:
+        cases: Iterable of (n_ribbons, carton_size, fleet_size, parade_modulus).
+        batch_size: Number of cases solved together.
+
+    Yields:
+        The answer of each test case, in input order.
+    """
+    cases = iter(cases)
+    while True:
+        batch = list(islice(cases, batch_size))
+        if not batch:
+            return
+        yield from minimum_kites_many(batch)
+
+
+def write_answers(answers, stream, batch_size: int = WRITE_BATCH_SIZE) -> None:
+    """
+    Write answers one per line through a bounded output buffer.
+
+    At most batch_size formatted answers are held before they are flushed,
+    and no trailing newline is written after the last answer.
+
+    Args:
+        answers: Iterable of integer answers.
+        stream: Text file-like object to write to.
+        batch_size: Number of answers buffered between writes.
+    """
+    pending: list = []
+    separator = ""
+    for answer in answers:
+        pending.append(str(answer))
+        if len(pending) >= batch_size:
+            stream.write(separator + "\n".join(pending))
+            separator = "\n"
+            pending.clear()
+
+    if pending:
+        stream.write(separator + "\n".join(pending))
+
+
+def write_binary_answers(
+    answers,
+    stream,
+    answer_count: int,
+    batch_size: int = WRITE_BATCH_SIZE,
+) -> None:
+    """
+    Write answers as a binary answer file: header, then one int64 each.
+
+    Args:
+        answers: Iterable of exactly answer_count integer answers.
+        stream: Binary file-like object to write to.
+        answer_count: Number of answers, stored in the header.
+        batch_size: Number of answers buffered between writes.
+
+    Raises:
+        ValueError: If answers does not hold answer_count values.
+    """
+    stream.write(BINARY_HEADER.pack(BINARY_ANSWERS_MAGIC, answer_count))
+    written = 0
+    answers = iter(answers)
+    while True:
+        pending = array("q", islice(answers, batch_size))
+        if not pending:
+            break
+        if _SWAP_BYTES:
+            pending.byteswap()
+        stream.write(pending.tobytes())
+        written += len(pending)
+
+    if written != answer_count:
+        raise ValueError(f"header promises {answer_count} answers, wrote {written}")
+
+
+def shard_boundaries(path: str, shard_count: int) -> list:
+    """
+    Split the cases of an input file into byte ranges on line boundaries.
+
+    Args:
+        path: Path of the input file (t on the first line, one case per line).
+        shard_count: Desired number of shards.
+
+    Returns:
+        List of (start, end) byte offsets covering every case line once,
+        in input order. Empty ranges are dropped.
+    """
+    with open(path, "rb") as handle:
+        handle.readline()
+        body_start = handle.tell()
+        body_end = os.fstat(handle.fileno()).st_size
+
+        offsets = [body_start]
+        for shard_index in range(1, shard_count):
+            target = body_start + (body_end - body_start) * shard_index // shard_count
+            if target <= offsets[-1]:
+                continue
+            handle.seek(target - 1)
+            handle.readline()
+            offsets.append(min(handle.tell(), body_end))
+        offsets.append(body_end)
+
+    return [
+        (start, end)
+        for start, end in zip(offsets, offsets[1:])
+        if start < end
+    ]
+
+
+class _ByteRange:
+    """
+    Read-only stream over bytes [start, end) of an open binary file.
+    """
+
+    def __init__(self, handle, start: int, end: int) -> None:
+        handle.seek(start)
+        self._handle = handle
+        self._remaining = end - start
+
+    def read(self, size: int) -> bytes:
+        data = self._handle.read(min(size, self._remaining))
+        self._remaining -= len(data)
+        return data
+
+
+def solve_shard(path: str, start: int, end: int, solver=minimum_kites) -> str:
+    """
+    Solve every case stored in one byte range of an input file.
+
+    The range is parsed with iter_tokens, one READ_CHUNK_SIZE chunk at a
+    time.
+
+    Args:
+        path: Path of the input file.
+        start: Offset of the first byte of the shard (a line start).
+        end: Offset one past the last byte of the shard (a line start or EOF).
+        solver: Function (n, c, d, p) -> answer used for each case.
+
+    Returns:
+        The shard's answers joined by newlines.
+    """
+    with open(path, "rb") as handle:
+        tokens = iter_tokens(_ByteRange(handle, start, end))
+        return "\n".join(
+            str(solver(n_ribbons, carton_size, fleet_size, parade_modulus))
+            for n_ribbons, carton_size, fleet_size, parade_modulus
+            in zip(tokens, tokens, tokens, tokens)
+        )
+
+
+def _init_worker(backend_name, small_table_path) -> None:
+    if backend_name is not None:
+        set_backend(backend_name)
+    if small_table_path is not None:
+        load_small_table(small_table_path)
+
+
+def solve_sharded(
+    path: str,
+    workers: int,
+    stream,
+    solver=minimum_kites,
+    backend_name=None,
+    small_table_path=None,
+) -> None:
+    """
+    Solve an input file across a process pool and write answers in order.
+
+    Shards hold at most about SHARD_MAX_BYTES of input, and at most
+    workers * SHARDS_PER_WORKER of them are in flight at a time, so memory
+    does not grow with the input size.
+
+    Args:
+        path: Path of the input file.
+        workers: Number of worker processes.
+        stream: Text file-like object to write to.
+        solver: Module-level function (n, c, d, p) -> answer run in workers.
+        backend_name: Number-theory backend selected in every worker, or
+            None for the workers' default.
+        small_table_path: Small-parameter table loaded in every worker for
+            minimum_kites_tabled, or None.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    shard_count = max(workers * SHARDS_PER_WORKER, -(-os.path.getsize(path) // SHARD_MAX_BYTES))
+    max_in_flight = workers * SHARDS_PER_WORKER
+    separator = ""
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(backend_name, small_table_path),
+    ) as executor:
+        pending: deque = deque()
+        for start, end in shard_boundaries(path, shard_count):
+            pending.append(executor.submit(solve_shard, path, start, end, solver))
+            while len(pending) > max_in_flight or (pending and pending[0].done()):
+                shard_output = pending.popleft().result()
+                if shard_output:
+                    stream.write(separator + shard_output)
+                    separator = "\n"
+        while pending:
+            shard_output = pending.popleft().result()
+            if shard_output:
+                stream.write(separator + shard_output)
+                separator = "\n"
+
+
+def euclid_step_count(first: int, second: int) -> int:
+    """
+    Count the division steps extended_gcd(first, second) would run.
+
+    Args:
+        first: First integer.
+        second: Second integer.
+
+    Returns:
+        Number of iterations of the Euclidean loop.
+    """
+    steps = 0
+    while second != 0:
+        first, second = second, first % second
+        steps += 1
+    return steps
+
+
+class StageProfile:
+    """
+    Counters, per-stage timing histograms and Euclid step counts.
+
+    Timings are bucketed by the bit length of the elapsed nanoseconds, so a
+    bucket k holds calls that took between 2**(k-1) and 2**k ns.
+    """
+
+    def __init__(self) -> None:
+        self.counters: dict = {}
+        self.stages: dict = {}
+        self.euclid_steps: dict = {}
+
+    def count(self, name: str) -> None:
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    def record(self, stage: str, elapsed_ns: int) -> None:
+        entry = self.stages.get(stage)
+        if entry is None:
+            entry = self.stages[stage] = {"calls": 0, "total_ns": 0, "histogram": {}}
+        entry["calls"] += 1
+        entry["total_ns"] += elapsed_ns
+        histogram = entry["histogram"]
+        bucket = elapsed_ns.bit_length()
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+
+    def record_euclid(self, steps: int) -> None:
+        self.euclid_steps[steps] = self.euclid_steps.get(steps, 0) + 1
+
+    def summary(self) -> dict:
+        """
+        Build the JSON-serializable report.
+        """
+        stages = {}
+        for stage, entry in self.stages.items():
+            stages[stage] = {
+                "calls": entry["calls"],
+                "total_ns": entry["total_ns"],
+                "mean_ns": entry["total_ns"] / entry["calls"],
+                "log2_ns_histogram": {
+                    f"<2^{bucket}": count
+                    for bucket, count in sorted(entry["histogram"].items())
+                },
+            }
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "stages": stages,
+            "euclid_steps": {
+                str(steps): count
+                for steps, count in sorted(self.euclid_steps.items())
+            },
+        }
+
+    def dump(self, path) -> None:
+        """
+        Write the summary as JSON to path, or to stderr when path is None.
+        """
+        import json
+
+        report = json.dumps(self.summary(), indent=2)
+        if path is None:
+            sys.stderr.write(report + "\n")
+            return
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(report + "\n")
+
+
+class _ProfiledBackend(NumberTheoryBackend):
+    """
+    Wraps a backend and records the Euclid step count of every inverse.
+    """
+
+    def __init__(self, inner: NumberTheoryBackend) -> None:
+        self.inner = inner
+        self.name = inner.name
+        self.gcd = inner.gcd
+
+    def inverse(self, value: int, modulus: int) -> int:
+        _profile.record_euclid(euclid_step_count(value, modulus))
+        return self.inner.inverse(value, modulus)
+
+
+def _timed(stage: str, function):
+    def timed(*args):
+        began = time.perf_counter_ns()
+        result = function(*args)
+        _profile.record(stage, time.perf_counter_ns() - began)
+        return result
+
+    timed.__wrapped__ = function
+    return timed
+
+
+def _profiled_minimum_kites(
+    n_ribbons: int,
+    carton_size: int,
+    fleet_size: int,
+    parade_modulus: int,
+) -> int:
+    began = time.perf_counter_ns()
+    answer = _unprofiled["minimum_kites"](
+        n_ribbons,
+        carton_size,
+        fleet_size,
+        parade_modulus,
+        _profile.count,
+    )
+    _profile.record("minimum_kites", time.perf_counter_ns() - began)
+    return answer
+
+
+def _profiled_cases(cases):
+    while True:
+        began = time.perf_counter_ns()
+        case = next(cases, None)
+        _profile.record("parse", time.perf_counter_ns() - began)
+        if case is None:
+            return
+        yield case
+
+
+def _profiled_iter_test_cases(stream, chunk_size: int = READ_CHUNK_SIZE):
+    return _profiled_cases(_unprofiled["iter_test_cases"](stream, chunk_size))
+
+
+def _profiled_iter_mapped_test_cases(path: str):
+    return _profiled_cases(_unprofiled["iter_mapped_test_cases"](path))
+
+
+class _TimedStream:
+    """
+    Forwards writes to a stream, recording each as the output stage.
+    """
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+
+    def write(self, text: str) -> None:
+        began = time.perf_counter_ns()
+        self._stream.write(text)
+        _profile.record("output", time.perf_counter_ns() - began)
+
+
+def _profiled_write_answers(
+    answers,
+    stream,
+    batch_size: int = WRITE_BATCH_SIZE,
+) -> None:
+    _unprofiled["write_answers"](answers, _TimedStream(stream), batch_size)
+
+
+_profile = None
+_unprofiled: dict = {}
+
+
+def enable_profiling(path=None) -> StageProfile:
+    """
+    Turn on stage instrumentation and dump a JSON summary at exit.
+
+    Profiling works by rebinding this module's hot-path functions to
+    instrumented twins, so nothing is paid while it is off.
+
+    Args:
+        path: File to write the summary to, or None for stderr.
+
+    Returns:
+        The active StageProfile.
+    """
+    global _profile, _backend
+    if _profile is not None:
+        return _profile
+
+    _profile = StageProfile()
+    module_globals = globals()
+    for name in (
+        "solve_linear_congruence",
+        "merge_congruences",
+        "minimum_kites",
+        "iter_test_cases",
+        "iter_mapped_test_cases",
+        "write_answers",
+    ):
+        _unprofiled[name] = module_globals[name]
+
+    module_globals["solve_linear_congruence"] = _timed(
+        "solve_linear_congruence",
+        _unprofiled["solve_linear_congruence"],
+    )
+    module_globals["merge_congruences"] = _timed(
+        "merge_congruences",
+        _unprofiled["merge_congruences"],
+    )
+    module_globals["minimum_kites"] = _profiled_minimum_kites
+    module_globals["iter_test_cases"] = _profiled_iter_test_cases
+    module_globals["iter_mapped_test_cases"] = _profiled_iter_mapped_test_cases
+    module_globals["write_answers"] = _profiled_write_answers
+    _backend = _ProfiledBackend(_backend)
+
+    atexit.register(_profile.dump, path)
+    return _profile
+
+
+def main(argv=None) -> None:
+    """
+    Read input, solve all test cases, and print outputs.
+
+    Args:
+        argv: Command-line arguments; defaults to sys.argv[1:].
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        # Plain stdin-to-stdout run: skip building the parser.
+        write_answers(solve_cases(iter_test_cases(sys.stdin.buffer), minimum_kites), sys.stdout)
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Kite Ribbon Ledger solver.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="solve byte-range shards of the input on this many processes",
+    )
+    parser.add_argument(
+        "--input",
+        help="read cases from this file instead of stdin",
+    )
+    parser.add_argument(
+        "--plan-cache",
+        type=int,
+        default=0,
+        metavar="SIZE",
+        help="reuse precomputed (c, d, p) plans from an LRU cache of this size"
+        " and report its hit/miss counters on stderr",
+    )
+    parser.add_argument(
+        "--small-table",
+        metavar="PATH",
+        help="answer small (c, d, p) from this precomputed table"
+        " (see misc/small_table_builder.py)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        help="number-theory backend for gcd, inverse and CRT merge",
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=0,
+        metavar="SIZE",
+        help="solve this many cases at a time, sharing modular inversions",
+    )
+    parser.add_argument(
+        "--certificates",
+        metavar="PATH",
+        help="also write one correctness certificate per case to PATH",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="record per-stage counters and timings and dump them as JSON"
+        " to PATH ('-' for stderr) at exit",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "binary"),
+        default="text",
+        help="read binary case records and write binary answer records"
+        " instead of decimal text",
+    )
+    args = parser.parse_args(argv)
+    if args.certificates is not None and args.workers > 1:
+        parser.error("--certificates is only supported with a single worker")
+    if args.small_table is not None and args.plan_cache > 0:
+        parser.error("--small-table and --plan-cache cannot be combined")
+    if args.format == "binary" and args.workers > 1:
+        parser.error("--format binary is only supported with a single worker")
+    if args.batch > 0 and args.workers > 1:
+        parser.error("--batch is only supported with a single worker")
+    if args.plan_cache > 0 and (args.batch > 0 or args.certificates is not None):
+        parser.error("--plan-cache cannot be combined with --batch or --certificates")
+    if args.plan_cache > 0 and args.workers > 1:
+        parser.error("--plan-cache is only supported with a single worker")
+    if args.small_table is not None and (args.batch > 0 or args.certificates is not None):
+        parser.error("--small-table cannot be combined with --batch or --certificates")
+    if args.certificates is not None and args.batch > 0:
+        parser.error("--certificates and --batch cannot be combined")
+    if args.workers > 1 and (args.profile is not None or _profile is not None):
+        # Workers keep their own counters, so the parent would dump nothing.
+        parser.error("--profile and KITE_PROFILE are only supported with a single worker")
+
+    if args.profile is not None:
+        enable_profiling(None if args.profile == "-" else args.profile)
+
+    if args.backend is not None:
+        set_backend(args.backend)
+
+    solver = minimum_kites
+    if args.plan_cache > 0:
+        set_plan_cache_size(args.plan_cache)
+        solver = minimum_kites_planned
+    if args.small_table is not None:
+        load_small_table(args.small_table)
+        solver = minimum_kites_tabled
+
+    if args.workers > 1:
+        if args.input is not None:
+            solve_sharded(
+                args.input,
+                args.workers,
+                sys.stdout,
+                solver,
+                args.backend,
+                args.small_table,
+            )
+        else:
+            import shutil
+            import tempfile
+
+            with tempfile.NamedTemporaryFile(suffix=".in") as spool:
+                shutil.copyfileobj(sys.stdin.buffer, spool)
+                spool.flush()
+                solve_sharded(
+                    spool.name,
+                    args.workers,
+                    sys.stdout,
+                    solver,
+                    args.backend,
+                    args.small_table,
+                )
+    else:
+        with ExitStack() as stack:
+            if args.format == "binary":
+                if args.input is None:
+                    source = sys.stdin.buffer
+                else:
+                    source = stack.enter_context(open(args.input, "rb"))
+                try:
+                    case_count = read_binary_header(source, BINARY_CASES_MAGIC)
+                except ValueError as e:
+                    parser.exit(1, f"error: {e}\n")
+                cases = iter_binary_test_cases(source, case_count)
+            elif args.input is None:
+                cases = iter_test_cases(sys.stdin.buffer)
+            else:
+                cases = iter_mapped_test_cases(args.input)
+
+            if args.certificates is not None:
+                certificates = stack.enter_context(
+                    open(args.certificates, "w", encoding="utf-8")
+                )
+                answers = solve_cases_certified(cases, certificates)
+            elif args.batch > 0:
+                answers = solve_cases_batched(cases, args.batch)
+            else:
+                answers = solve_cases(cases, solver)
+
+            if args.format == "binary":
+                try:
+                    write_binary_answers(answers, sys.stdout.buffer, case_count)
+                except ValueError as e:
+                    parser.exit(1, f"error: {e}\n")
+            else:
+                write_answers(answers, sys.stdout)
+
+    if args.plan_cache > 0:
+        sys.stderr.write(f"plan cache: {plan_cache_stats()}\n")
+
+
+if os.environ.get(PROFILE_ENV):
+    enable_profiling(
+        None if os.environ[PROFILE_ENV] in ("1", "-") else os.environ[PROFILE_ENV]
+    )
 
 
 if __name__ == "__main__":